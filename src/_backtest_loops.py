@@ -0,0 +1,572 @@
+"""
+Backtest Loops
+Numba-compiled trade simulation and summary kernels used by the backtest engine and optimizer
+
+Both kernels are declared with explicit signatures so they compile eagerly when
+this module is imported and are persisted to the on-disk cache. The optimizer's
+forkserver preloads this module, so pool workers load the cached machine code
+instead of recompiling it per process.
+"""
+import numpy as np
+from numba import njit, prange, types
+
+# Exit reason codes returned by _run_backtest_njit
+EXIT_STOP_LOSS = 0
+EXIT_TAKE_PROFIT = 1
+EXIT_TIME = 2
+EXIT_END_OF_DATA = 3
+EXIT_REASONS = ('stop_loss', 'take_profit', 'time_exit', 'end_of_data')
+
+# Filter outcome codes returned by _summary_with_filters
+PASSED = -1
+REASON_NO_TRADES = 0
+REASON_INSUFFICIENT_TRADES = 1
+REASON_PF_FAIL = 2
+REASON_DD_FAIL = 3
+REASON_ERROR = 4
+REASON_NAMES = ('no_trades', 'insufficient_trades', 'pf_fail', 'dd_fail', 'error')
+
+# Input arrays are declared read-only so both writable arrays and the read-only
+# views handed out by pandas copy-on-write match the same compiled signature
+_i8_in = types.Array(types.int64, 1, 'A', readonly=True)
+_f4_in = types.Array(types.float32, 1, 'A', readonly=True)
+_f8_in = types.Array(types.float64, 1, 'A', readonly=True)
+_i8_out = types.Array(types.int64, 1, 'C')
+_f8_out = types.Array(types.float64, 1, 'C')
+_i1_out = types.Array(types.int8, 1, 'C')
+_u1_out = types.Array(types.uint8, 1, 'C')
+_u1_table_in = types.Array(types.uint8, 2, 'C', readonly=True)
+
+_BACKTEST_RETURN = types.Tuple((
+    _i8_out, _i8_out, _f8_out, _f8_out, _f8_out, _f8_out, _f8_out, _f8_out, _i1_out
+))
+
+# Price/ATR inputs come either as float64 or as float32 (quantized optimizer data);
+# results are always float64
+_BACKTEST_SIGNATURES = [
+    _BACKTEST_RETURN(_i8_in, prices, prices, prices, prices, types.float64, types.float64,
+                     types.int64, types.int8, types.boolean)
+    for prices in (_f8_in, _f4_in)
+]
+
+_SUMMARY_SIGNATURE = types.Tuple((
+    types.int64, types.int64, types.float64, types.float64, types.float64,
+    types.float64, types.float64, types.float64, types.float64, types.float64
+))(_f8_in, _i8_in, _f8_in, _f8_in, types.int64, types.float64, types.float64)
+
+
+@njit(cache=True)
+def _scan_trade(e, entry_price, stop, target, high, low, close, max_hold_bars,
+                direction, breakeven_at_tp1):
+    """
+    Walk forward from entry bar e until the trade exits
+
+    Returns:
+    --------
+    Tuple of (exit_bar, exit_price, final stop, exit_reason, lowest low, highest high)
+    """
+    n = close.shape[0]
+    lowest = low[e]
+    highest = high[e]
+    exit_bar = n - 1
+    exit_price = close[n - 1]
+    reason = EXIT_END_OF_DATA
+
+    for j in range(e + 1, n):
+        if low[j] < lowest:
+            lowest = low[j]
+        if high[j] > highest:
+            highest = high[j]
+
+        if max_hold_bars >= 0 and j - e >= max_hold_bars:
+            exit_bar = j
+            exit_price = close[j]
+            reason = EXIT_TIME
+            break
+
+        if direction == 1:
+            if low[j] <= stop:
+                exit_bar = j
+                exit_price = stop
+                reason = EXIT_STOP_LOSS
+                break
+            if high[j] >= target:
+                exit_bar = j
+                exit_price = target
+                reason = EXIT_TAKE_PROFIT
+                break
+            if breakeven_at_tp1:
+                tp1 = entry_price + (target - entry_price) / 2
+                if high[j] >= tp1 and stop < entry_price:
+                    stop = entry_price
+        else:
+            if high[j] >= stop:
+                exit_bar = j
+                exit_price = stop
+                reason = EXIT_STOP_LOSS
+                break
+            if low[j] <= target:
+                exit_bar = j
+                exit_price = target
+                reason = EXIT_TAKE_PROFIT
+                break
+            if breakeven_at_tp1:
+                tp1 = entry_price - (entry_price - target) / 2
+                if low[j] <= tp1 and stop > entry_price:
+                    stop = entry_price
+
+    return exit_bar, exit_price, stop, reason, lowest, highest
+
+
+@njit(_BACKTEST_SIGNATURES, cache=True)
+def _run_backtest_njit(entries, high, low, close, atr, stop_loss_atr, take_profit_atr,
+                       max_hold_bars, direction, breakeven_at_tp1):
+    """
+    Simulate one-position-at-a-time trades over candidate entry bars
+
+    Parameters:
+    -----------
+    entries : int64 array
+        Ascending bar indices where the entry condition is true
+    high, low, close, atr : float64 or float32 arrays
+        Price and ATR columns
+    stop_loss_atr, take_profit_atr : float
+        SL/TP distance in ATR multiples
+    max_hold_bars : int
+        Maximum bars to hold a trade (-1 for no limit)
+    direction : int
+        1 for long, -1 for short
+    breakeven_at_tp1 : bool
+        Move SL to breakeven once price reaches half of the TP distance
+
+    Returns:
+    --------
+    Tuple of (entry_idx, exit_idx, stop_loss, take_profit, exit_price, pnl, mae, mfe, exit_reason)
+    """
+    n = close.shape[0]
+    m = entries.shape[0]
+
+    entry_idx = np.empty(m, np.int64)
+    exit_idx = np.empty(m, np.int64)
+    stops = np.empty(m, np.float64)
+    targets = np.empty(m, np.float64)
+    exit_prices = np.empty(m, np.float64)
+    pnl = np.empty(m, np.float64)
+    mae = np.empty(m, np.float64)
+    mfe = np.empty(m, np.float64)
+    reasons = np.empty(m, np.int8)
+
+    count = 0
+    next_free = 0
+
+    for k in range(m):
+        e = entries[k]
+        if e < next_free:
+            continue
+
+        entry_price = close[e]
+        if direction == 1:
+            stop = entry_price - stop_loss_atr * atr[e]
+            target = entry_price + take_profit_atr * atr[e]
+        else:
+            stop = entry_price + stop_loss_atr * atr[e]
+            target = entry_price - take_profit_atr * atr[e]
+        take_profit = target
+
+        exit_bar, exit_price, stop, reason, lowest, highest = _scan_trade(
+            e, entry_price, stop, target, high, low, close, max_hold_bars,
+            direction, breakeven_at_tp1
+        )
+
+        entry_idx[count] = e
+        exit_idx[count] = exit_bar
+        stops[count] = stop
+        targets[count] = take_profit
+        exit_prices[count] = exit_price
+        if direction == 1:
+            pnl[count] = exit_price - entry_price
+            mae[count] = (lowest - entry_price) / entry_price * 100
+            mfe[count] = (highest - entry_price) / entry_price * 100
+        else:
+            pnl[count] = entry_price - exit_price
+            mae[count] = (entry_price - highest) / entry_price * 100
+            mfe[count] = (entry_price - lowest) / entry_price * 100
+        reasons[count] = reason
+        count += 1
+
+        # A new trade may open on the same bar the previous one closed
+        next_free = exit_bar if reason != EXIT_END_OF_DATA else n
+
+    return (entry_idx[:count], exit_idx[:count], stops[:count], targets[:count],
+            exit_prices[:count], pnl[:count], mae[:count], mfe[:count], reasons[:count])
+
+
+@njit(cache=True)
+def _finish_summary(n, wins, gross_win, gross_loss, equity, max_dd, peak_at_max_dd,
+                    sum_bars, sum_mae, sum_mfe, min_trades, min_pf, max_dd_limit):
+    """Turn running trade accumulators into the summary tuple and filter outcome"""
+    gross_loss = abs(gross_loss)
+    if gross_loss > 0:
+        profit_factor = gross_win / gross_loss
+    elif gross_win > 0:
+        profit_factor = np.inf
+    else:
+        profit_factor = 0.0
+
+    if peak_at_max_dd != 0:
+        max_dd_pct = abs(max_dd / peak_at_max_dd * 100)
+    else:
+        max_dd_pct = 0.0
+
+    win_rate = wins / n * 100
+
+    if n < min_trades:
+        reason = REASON_INSUFFICIENT_TRADES
+    elif profit_factor < min_pf:
+        reason = REASON_PF_FAIL
+    elif max_dd_pct > max_dd_limit:
+        reason = REASON_DD_FAIL
+    else:
+        reason = PASSED
+
+    return (reason, n, win_rate, profit_factor, max_dd_pct, equity,
+            equity / n, sum_bars / n, sum_mae / n, sum_mfe / n)
+
+
+@njit(_SUMMARY_SIGNATURE, cache=True)
+def _summary_with_filters(pnl, bars_held, mae, mfe, min_trades, min_pf, max_dd_limit):
+    """
+    Compute summary statistics and apply the optimizer's acceptance filters
+
+    Mirrors utils.create_summary_stats for the metrics the optimizer keeps.
+
+    Returns:
+    --------
+    Tuple of (reason, total_trades, win_rate, profit_factor, max_dd_pct,
+    total_pnl, avg_pnl_per_trade, avg_bars_held, avg_mae, avg_mfe)
+    where reason is PASSED or one of the REASON_* codes
+    """
+    n = pnl.shape[0]
+    if n == 0:
+        return REASON_NO_TRADES, 0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0
+
+    wins = 0
+    gross_win = 0.0
+    gross_loss = 0.0
+    equity = 0.0
+    running_max = 0.0
+    max_dd = 0.0
+    peak_at_max_dd = 0.0
+    sum_bars = 0.0
+    sum_mae = 0.0
+    sum_mfe = 0.0
+
+    for i in range(n):
+        p = pnl[i]
+        if p > 0:
+            wins += 1
+            gross_win += p
+        elif p < 0:
+            gross_loss += p
+
+        equity += p
+        if i == 0 or equity > running_max:
+            running_max = equity
+        dd = equity - running_max
+        if i == 0 or dd < max_dd:
+            max_dd = dd
+            peak_at_max_dd = running_max
+
+        sum_bars += bars_held[i]
+        sum_mae += mae[i]
+        sum_mfe += mfe[i]
+
+    return _finish_summary(n, wins, gross_win, gross_loss, equity, max_dd, peak_at_max_dd,
+                           sum_bars, sum_mae, sum_mfe, min_trades, min_pf, max_dd_limit)
+
+
+_BACKTEST_SUMMARY_SIGNATURES = [
+    _SUMMARY_SIGNATURE.return_type(_i8_in, prices, prices, prices, prices, types.float64,
+                                   types.float64, types.int64, types.int8, types.boolean,
+                                   types.int64, types.float64, types.float64)
+    for prices in (_f8_in, _f4_in)
+]
+
+
+@njit(_BACKTEST_SUMMARY_SIGNATURES, cache=True)
+def _backtest_and_summarize(entries, high, low, close, atr, stop_loss_atr, take_profit_atr,
+                            max_hold_bars, direction, breakeven_at_tp1,
+                            min_trades, min_pf, max_dd_limit):
+    """
+    Simulate trades and summarize them in one pass without per-trade arrays
+
+    Equivalent to _summary_with_filters applied to the output of
+    _run_backtest_njit; summary accumulators are updated as each trade closes.
+
+    Returns:
+    --------
+    Same tuple as _summary_with_filters
+    """
+    n_bars = close.shape[0]
+    m = entries.shape[0]
+
+    n = 0
+    wins = 0
+    gross_win = 0.0
+    gross_loss = 0.0
+    equity = 0.0
+    running_max = 0.0
+    max_dd = 0.0
+    peak_at_max_dd = 0.0
+    sum_bars = 0.0
+    sum_mae = 0.0
+    sum_mfe = 0.0
+
+    next_free = 0
+
+    for k in range(m):
+        e = entries[k]
+        if e < next_free:
+            continue
+
+        entry_price = close[e]
+        if direction == 1:
+            stop = entry_price - stop_loss_atr * atr[e]
+            target = entry_price + take_profit_atr * atr[e]
+        else:
+            stop = entry_price + stop_loss_atr * atr[e]
+            target = entry_price - take_profit_atr * atr[e]
+
+        exit_bar, exit_price, stop, reason, lowest, highest = _scan_trade(
+            e, entry_price, stop, target, high, low, close, max_hold_bars,
+            direction, breakeven_at_tp1
+        )
+
+        if direction == 1:
+            p = exit_price - entry_price
+            sum_mae += (lowest - entry_price) / entry_price * 100
+            sum_mfe += (highest - entry_price) / entry_price * 100
+        else:
+            p = entry_price - exit_price
+            sum_mae += (entry_price - highest) / entry_price * 100
+            sum_mfe += (entry_price - lowest) / entry_price * 100
+        sum_bars += exit_bar - e
+
+        if p > 0:
+            wins += 1
+            gross_win += p
+        elif p < 0:
+            gross_loss += p
+
+        equity += p
+        if n == 0 or equity > running_max:
+            running_max = equity
+        dd = equity - running_max
+        if n == 0 or dd < max_dd:
+            max_dd = dd
+            peak_at_max_dd = running_max
+        n += 1
+
+        # A new trade may open on the same bar the previous one closed
+        next_free = exit_bar if reason != EXIT_END_OF_DATA else n_bars
+
+    if n == 0:
+        return REASON_NO_TRADES, 0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0
+
+    return _finish_summary(n, wins, gross_win, gross_loss, equity, max_dd, peak_at_max_dd,
+                           sum_bars, sum_mae, sum_mfe, min_trades, min_pf, max_dd_limit)
+
+
+@njit(_u1_out(_u1_table_in, _i8_in), parallel=True, cache=True)
+def _and_rows(table, rows):
+    """
+    Bitwise AND of selected rows of a 2-D table of packed masks
+
+    Parameters:
+    -----------
+    table : uint8 2-D array
+        One np.packbits mask per row
+    rows : int64 array
+        Rows to combine (at least one)
+
+    Returns:
+    --------
+    uint8 array with the packed AND of the selected rows
+    """
+    m = table.shape[1]
+    k = rows.shape[0]
+    out = np.empty(m, np.uint8)
+    for i in prange(m):
+        x = table[rows[0], i]
+        for r in range(1, k):
+            x &= table[rows[r], i]
+        out[i] = x
+    return out
+
+
+@njit(types.Array(types.uint8, 2, 'C')(_u1_table_in, _i8_in, _i8_in), parallel=True, cache=True)
+def _and_row_groups(table, rows, starts):
+    """
+    Bitwise AND of several groups of rows of a 2-D table of packed masks in one pass
+
+    Parameters:
+    -----------
+    table : uint8 2-D array
+        One np.packbits mask per row
+    rows : int64 array
+        Rows of every group, concatenated
+    starts : int64 array
+        Offset of each group in rows, plus a final len(rows) (each group
+        non-empty)
+
+    Returns:
+    --------
+    uint8 2-D array with the packed AND of each group, one row per group
+    """
+    m = table.shape[1]
+    g = starts.shape[0] - 1
+    out = np.empty((g, m), np.uint8)
+    for i in prange(m):
+        for j in range(g):
+            x = table[rows[starts[j]], i]
+            for r in range(starts[j] + 1, starts[j + 1]):
+                x &= table[rows[r], i]
+            out[j, i] = x
+    return out
+
+
+@njit(types.UniTuple(_f8_out, 6)(_f8_in, _f8_in, types.float64, types.float64), cache=True)
+def _trade_levels(close, atr, stop_atr, tp_atr):
+    """
+    Long-trade entry, stop, target, risk, reward and R:R for every bar in one pass
+
+    Parameters:
+    -----------
+    close, atr : float64 arrays
+        Entry prices and ATR values
+    stop_atr, tp_atr : float
+        Stop and target distances in ATR multiples
+
+    Returns:
+    --------
+    Tuple of (entry, stop_loss, take_profit, risk, reward, risk_reward) arrays;
+    risk_reward is 0 where risk is not positive
+    """
+    n = close.shape[0]
+    entry = np.empty(n, np.float64)
+    stop_loss = np.empty(n, np.float64)
+    take_profit = np.empty(n, np.float64)
+    risk = np.empty(n, np.float64)
+    reward = np.empty(n, np.float64)
+    risk_reward = np.empty(n, np.float64)
+
+    for i in range(n):
+        e = close[i]
+        sl = e - stop_atr * atr[i]
+        tp = e + tp_atr * atr[i]
+        r = e - sl
+        w = tp - e
+        entry[i] = e
+        stop_loss[i] = sl
+        take_profit[i] = tp
+        risk[i] = r
+        reward[i] = w
+        risk_reward[i] = w / r if r > 0 else 0.0
+
+    return entry, stop_loss, take_profit, risk, reward, risk_reward
+
+
+@njit(types.Tuple((_i8_out, _f8_out, _i8_out, _i1_out))(_i8_in, _f8_in, _f8_in, _f8_in, _f8_in,
+                                                       _f8_in, types.int64), cache=True, nogil=True)
+def _fixed_level_exits(entries, high, low, close, stops, targets, max_hold_bars):
+    """
+    Exit of independent long trades with fixed stop and target prices
+
+    Each trade is scanned on its own (trades may overlap): it exits on the
+    first bar after entry whose low reaches the stop (checked first) or whose
+    high reaches the target, else at the close max_hold_bars after entry.
+    Runs without the GIL, so backtests on other threads are not blocked.
+
+    Parameters:
+    -----------
+    entries : int64 array
+        Entry bar of each trade
+    high, low, close : float64 arrays
+        Price columns
+    stops, targets : float64 arrays
+        Stop and target price of each trade
+    max_hold_bars : int
+        Bars after which a trade exits at the close
+
+    Returns:
+    --------
+    Tuple of (exit_idx, exit_price, bars_held, exit_reason); exit_idx is -1
+    for trades whose time exit falls beyond the data
+    """
+    n = close.shape[0]
+    m = entries.shape[0]
+
+    exit_idx = np.full(m, -1, np.int64)
+    exit_prices = np.full(m, np.nan)
+    bars_held = np.zeros(m, np.int64)
+    reasons = np.full(m, EXIT_END_OF_DATA, np.int8)
+
+    for k in range(m):
+        e = entries[k]
+        stop = stops[k]
+        target = targets[k]
+
+        for j in range(e + 1, min(e + max_hold_bars + 1, n)):
+            if low[j] <= stop:
+                exit_idx[k] = j
+                exit_prices[k] = stop
+                reasons[k] = EXIT_STOP_LOSS
+                break
+            if high[j] >= target:
+                exit_idx[k] = j
+                exit_prices[k] = target
+                reasons[k] = EXIT_TAKE_PROFIT
+                break
+
+        if exit_idx[k] >= 0:
+            bars_held[k] = exit_idx[k] - e
+        elif 0 <= e + max_hold_bars < n:
+            exit_idx[k] = e + max_hold_bars
+            exit_prices[k] = close[e + max_hold_bars]
+            bars_held[k] = max_hold_bars
+            reasons[k] = EXIT_TIME
+
+    return exit_idx, exit_prices, bars_held, reasons
+
+
+def _warmup():
+    """
+    Run the serial kernels once on dummy data so the on-disk cache is populated
+
+    _and_rows and _and_row_groups are compiled by their signatures but not run
+    here, so numba's thread pool is not started in the forkserver (which runs
+    this on preload) before it forks worker processes.
+    """
+    size = 16
+    prices = np.linspace(100.0, 101.5, size)
+    entries = np.arange(0, size, 4, dtype=np.int64)
+    for dtype in (np.float64, np.float32):
+        p = prices.astype(dtype)
+        result = _run_backtest_njit(
+            entries, p + 0.5, p - 0.5, p, np.ones(size, dtype=dtype),
+            2.0, 3.0, np.int64(5), np.int8(1), False
+        )
+        _backtest_and_summarize(
+            entries, p + 0.5, p - 0.5, p, np.ones(size, dtype=dtype),
+            2.0, 3.0, np.int64(5), np.int8(1), False, np.int64(10), 1.25, 15.0
+        )
+    _summary_with_filters(
+        result[5], result[1] - result[0], result[6], result[7],
+        np.int64(10), 1.25, 15.0
+    )
+    _trade_levels(prices, np.ones(size), 1.2, 1.5)
+    _fixed_level_exits(entries, prices + 0.5, prices - 0.5, prices,
+                       prices[entries] - 1.0, prices[entries] + 1.0, np.int64(5))
+
+
+_warmup()
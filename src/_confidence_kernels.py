@@ -0,0 +1,128 @@
+"""
+Confidence Kernels
+Numba-compiled strategy scoring used by simple_confidence_scorer.SimpleConfidenceScorer
+
+_score_strategies applies the pattern strength rules of
+calculate_pattern_strength_confidence to every strategy of a scorer in one
+pass and combines them with the other confidence components. It is compiled
+eagerly from its signature and cached on disk.
+"""
+import numpy as np
+from numba import njit, types
+
+# Features read by the scorer with their defaults, in the order of the
+# conditions array (see SimpleConfidenceScorer._read_features)
+FEATURE_DEFAULTS = (
+    ('rsi_14', 50.0),
+    ('adx_14', 20.0),
+    ('volume', 1.0),
+    ('price_above_ema20', 0.0),
+    ('price_above_ema50', 0.0),
+    ('atr_pct', 1.0),
+    ('close', 0.0),
+    ('ema_20', 0.0),
+    ('ema_50', 0.0),
+    ('price_change_1', 0.0),
+    ('price_change_3', 0.0),
+)
+(RSI, ADX, VOLUME, PRICE_ABOVE_EMA20, PRICE_ABOVE_EMA50, ATR_PCT, CLOSE,
+ EMA_20, EMA_50, PRICE_CHANGE_1, PRICE_CHANGE_3) = range(len(FEATURE_DEFAULTS))
+
+# Features read by each confidence component; pattern strength also reads
+# the two features of its strategy's trend filter
+MARKET_FEATURES = (RSI, ADX, VOLUME, PRICE_ABOVE_EMA20, PRICE_ABOVE_EMA50, ATR_PCT)
+PATTERN_FEATURES = (RSI, ADX, ATR_PCT, VOLUME)
+RISK_FEATURES = (ATR_PCT, VOLUME, PRICE_CHANGE_1)
+
+# Rows of the thresholds table passed to _score_strategies
+RSI_MIN, ADX_MIN, ATR_MIN, ATR_MAX, VOLUME_MIN = range(5)
+
+# Trend filter kinds
+TREND_NONE = 0
+TREND_EMA20_ABOVE_EMA50 = 1
+TREND_PRICE_ABOVE_EMA20 = 2
+
+_f8_in = types.Array(types.float64, 1, 'C', readonly=True)
+_f8_table_in = types.Array(types.float64, 2, 'C', readonly=True)
+_i1_in = types.Array(types.int8, 1, 'C', readonly=True)
+_b1_in = types.Array(types.boolean, 1, 'C', readonly=True)
+_f8_out = types.Array(types.float64, 1, 'C')
+
+
+@njit(types.void(_f8_in, _b1_in, _f8_table_in, _i1_in, _b1_in, _f8_in,
+                 types.float64, types.float64, types.float64, types.float64,
+                 types.float64, types.float64, _f8_out, _f8_out),
+      cache=True)
+def _score_strategies(conditions, valid, thresholds, trend_kind, present, historical,
+                      market_conf, risk_conf, w_historical, w_market, w_pattern, w_risk,
+                      overall, pattern_conf):
+    """
+    Pattern strength and overall confidence for every strategy
+
+    Parameters:
+    -----------
+    conditions : float64 array
+        Current feature values, in FEATURE_DEFAULTS order
+    valid : bool array
+        Whether each feature could be read; pattern strength is 0.5 for a
+        strategy if any feature it reads could not
+    thresholds : float64 2-D array
+        Strategy thresholds, rows RSI_MIN ... VOLUME_MIN, one column per strategy
+    trend_kind : int8 array
+        TREND_* filter of each strategy
+    present : bool array
+        Whether each strategy's pattern is present
+    historical : float64 array
+        Historical confidence of each strategy
+    market_conf, risk_conf : float
+        Strategy-independent confidence components
+    w_historical, w_market, w_pattern, w_risk : float
+        Component weights
+    overall, pattern_conf : float64 arrays
+        Receive the overall and pattern strength confidence of each strategy
+    """
+    rsi = conditions[RSI]
+    adx = conditions[ADX]
+    atr_pct = conditions[ATR_PCT]
+    volume = conditions[VOLUME]
+    base_valid = valid[RSI] and valid[ADX] and valid[ATR_PCT] and valid[VOLUME]
+
+    for i in range(present.shape[0]):
+        if not present[i]:
+            pattern_conf[i] = 0.0
+            overall[i] = 0.0
+            continue
+
+        strategy_valid = base_valid
+        if trend_kind[i] == TREND_EMA20_ABOVE_EMA50:
+            strategy_valid = strategy_valid and valid[EMA_20] and valid[EMA_50]
+        elif trend_kind[i] == TREND_PRICE_ABOVE_EMA20:
+            strategy_valid = strategy_valid and valid[CLOSE] and valid[EMA_20]
+
+        if strategy_valid:
+            score = 1.0
+            if rsi < thresholds[RSI_MIN, i]:
+                score *= 0.5
+            if adx < thresholds[ADX_MIN, i]:
+                score *= 0.5
+            if not (thresholds[ATR_MIN, i] <= atr_pct <= thresholds[ATR_MAX, i]):
+                score *= 0.7
+            if volume < thresholds[VOLUME_MIN, i]:
+                score *= 0.8
+            if trend_kind[i] == TREND_EMA20_ABOVE_EMA50:
+                if conditions[EMA_20] <= conditions[EMA_50]:
+                    score *= 0.3
+            elif trend_kind[i] == TREND_PRICE_ABOVE_EMA20:
+                if conditions[CLOSE] <= conditions[EMA_20]:
+                    score *= 0.3
+            score = min(max(score, 0.0), 1.0)
+        else:
+            score = 0.5
+
+        pattern_conf[i] = score
+        overall[i] = (
+            historical[i] * w_historical +
+            market_conf * w_market +
+            score * w_pattern +
+            risk_conf * w_risk
+        )
@@ -0,0 +1,384 @@
+"""
+Pattern Kernels
+Numba-compiled fused candlestick pattern detection used by patterns.detect_all_patterns
+
+The kernel evaluates every pattern for a bar in one pass over the OHLC arrays,
+using the same rules and default parameters as the detect_* functions in
+patterns.py. _detect_tail applies the same per-bar rules to the latest bars
+only, for streaming updates. _simple_patterns is the smaller rule set of
+yahoo_backtest_engine.YahooBacktestEngine._calculate_simple_patterns. All are
+compiled eagerly from their signatures and cached on disk.
+"""
+import numpy as np
+from numba import njit, prange, types
+
+# Output rows of _detect_all, in detect_all_patterns column order
+PATTERN_NAMES = (
+    # Single-bar patterns
+    'pattern_inside_bar',
+    'pattern_outside_bar',
+    'pattern_doji',
+    'pattern_hammer',
+    'pattern_shooting_star',
+    'pattern_pin_bar',
+    'pattern_bullish_pin',
+    'pattern_bearish_pin',
+    'pattern_marubozu_bull',
+    'pattern_marubozu_bear',
+    # Two-bar patterns
+    'pattern_bullish_engulfing',
+    'pattern_bearish_engulfing',
+    'pattern_tweezer_bottom',
+    'pattern_tweezer_top',
+    'pattern_harami_bull',
+    'pattern_harami_bear',
+    # Three-bar patterns
+    'pattern_morning_star',
+    'pattern_evening_star',
+    'pattern_three_white_soldiers',
+    'pattern_three_black_crows',
+    # Breakout patterns
+    'pattern_breakout_20',
+    'pattern_breakdown_20',
+    'pattern_breakout_10',
+    'pattern_breakdown_10',
+    # Range patterns
+    'pattern_range_expansion',
+)
+
+# Default detector parameters
+BODY_RATIO = 0.3
+WICK_RATIO = 2.0
+DOJI_BODY_THRESHOLD = 0.1
+PIN_WICK_RATIO = 0.66
+MARUBOZU_WICK_THRESHOLD = 0.05
+TWEEZER_TOLERANCE = 0.001
+RANGE_PERIOD = 20
+RANGE_THRESHOLD = 1.5
+
+# Most bars before the current one that any pattern reads
+MAX_LOOKBACK = 20
+
+# Output rows of _simple_patterns, in _calculate_simple_patterns column order
+SIMPLE_PATTERN_NAMES = (
+    'pattern_doji',
+    'pattern_hammer',
+    'pattern_breakout_10',
+    'pattern_breakout_20',
+    'pattern_range_expansion',
+    'inside_bar',
+)
+SIMPLE_DOJI_THRESHOLD = 0.1
+SIMPLE_BREAKOUT_MARGIN = 1.001
+SIMPLE_RANGE_THRESHOLD = 1.5
+
+_f8_in = types.Array(types.float64, 1, 'A', readonly=True)
+_f8_out = types.Array(types.float64, 1, 'C')
+_u1_out_2d = types.Array(types.uint8, 2, 'C')
+_i1_out_2d = types.Array(types.int8, 2, 'C')
+
+
+@njit(_f8_out(_f8_in, types.int64, types.boolean), cache=True)
+def _rolling_extreme(a, window, is_max):
+    """
+    Rolling max (is_max) or min over `window` bars with a monotonic deque
+
+    Each index enters and leaves the deque once, so the cost is O(n)
+    regardless of the window. Like pandas rolling(window).max()/min(), the
+    first window - 1 values and any window containing NaN are NaN.
+    """
+    n = a.shape[0]
+    out = np.empty(n, np.float64)
+    dq = np.empty(n, np.int64)
+    head = 0
+    tail = 0
+    last_nan = -1
+
+    for i in range(n):
+        x = a[i]
+        if np.isnan(x):
+            last_nan = i
+        else:
+            if is_max:
+                while tail > head and a[dq[tail - 1]] <= x:
+                    tail -= 1
+            else:
+                while tail > head and a[dq[tail - 1]] >= x:
+                    tail -= 1
+            dq[tail] = i
+            tail += 1
+        while tail > head and dq[head] <= i - window:
+            head += 1
+
+        if i < window - 1 or last_nan > i - window:
+            out[i] = np.nan
+        else:
+            out[i] = a[dq[head]]
+
+    return out
+
+
+@njit(_f8_out(_f8_in, types.int64), cache=True)
+def _rolling_mean(a, window):
+    """
+    Rolling mean over `window` bars with a running sum
+
+    Follows pandas rolling(window).mean() step for step (compensated add and
+    remove, runs of equal values, sign clamping) so the results are
+    identical: NaN until `window` non-NaN values are in the window.
+    """
+    n = a.shape[0]
+    out = np.empty(n, np.float64)
+    total = 0.0
+    comp_add = 0.0
+    comp_remove = 0.0
+    nobs = 0
+    neg_ct = 0
+    same_ct = 0
+    prev = a[0] if n > 0 else 0.0
+
+    for i in range(n):
+        if i >= window:
+            x = a[i - window]
+            if not np.isnan(x):
+                nobs -= 1
+                y = -x - comp_remove
+                t = total + y
+                comp_remove = t - total - y
+                total = t
+                if np.signbit(x):
+                    neg_ct -= 1
+
+        x = a[i]
+        if not np.isnan(x):
+            nobs += 1
+            y = x - comp_add
+            t = total + y
+            comp_add = t - total - y
+            total = t
+            if np.signbit(x):
+                neg_ct += 1
+            if x == prev:
+                same_ct += 1
+            else:
+                same_ct = 1
+            prev = x
+
+        if nobs >= window:
+            mean = total / nobs
+            if same_ct >= nobs:
+                mean = prev
+            elif neg_ct == 0 and mean < 0:
+                mean = 0.0
+            elif neg_ct == nobs and mean > 0:
+                mean = 0.0
+            out[i] = mean
+        else:
+            out[i] = np.nan
+
+    return out
+
+
+@njit(cache=True, error_model='numpy', inline='always')
+def _bar_patterns(o, h, l, c, i, prev_high_20, prev_low_20, prev_high_10, prev_low_10, out, col):
+    """
+    Evaluate all patterns for bar i and write them to out[:, col]
+
+    prev_high_20 ... prev_low_10 are the rolling 20/10-bar high and low ending
+    at bar i - 1, or NaN when bar i has fewer bars of history than that.
+    Shared by _detect_all (whole history) and _detect_tail (latest bars).
+    """
+    oi = o[i]
+    hi = h[i]
+    li = l[i]
+    ci = c[i]
+
+    move = ci - oi
+    body = abs(move)
+    rng = hi - li
+    lower_wick = np.fmin(oi, ci) - li
+    upper_wick = hi - np.fmax(oi, ci)
+
+    # Single-bar patterns, with ratio thresholds cross-multiplied
+    # (x / (rng + 1e-10) >= t becomes x >= t * (rng + 1e-10)) so no division
+    # is needed. The 1e-10 margin is kept: on tick-rounded prices ratios often
+    # land exactly on a threshold and the margin decides those ties.
+    small_body = (rng > 0) & (body <= BODY_RATIO * rng)
+    out[2, col] = body <= DOJI_BODY_THRESHOLD * (rng + 1e-10)
+    out[3, col] = small_body & (lower_wick >= WICK_RATIO * (body + 1e-10)) & (upper_wick < body)
+    out[4, col] = small_body & (upper_wick >= WICK_RATIO * (body + 1e-10)) & (lower_wick < body)
+    bullish_pin = lower_wick >= PIN_WICK_RATIO * (rng + 1e-10)
+    bearish_pin = upper_wick >= PIN_WICK_RATIO * (rng + 1e-10)
+    out[5, col] = bullish_pin | bearish_pin
+    out[6, col] = bullish_pin
+    out[7, col] = bearish_pin
+    out[8, col] = (move > 0) & (move >= (1 - MARUBOZU_WICK_THRESHOLD) * (rng + 1e-10))
+    out[9, col] = (move < 0) & (-move >= (1 - MARUBOZU_WICK_THRESHOLD) * (rng + 1e-10))
+
+    # Two-bar patterns
+    if i >= 1:
+        o1 = o[i - 1]
+        h1 = h[i - 1]
+        l1 = l[i - 1]
+        c1 = c[i - 1]
+        move1 = c1 - o1
+
+        out[0, col] = (hi < h1) & (li > l1)
+        out[1, col] = (hi > h1) & (li < l1)
+        out[10, col] = (c1 < o1) & (ci > oi) & (oi <= c1) & (ci >= o1)
+        out[11, col] = (c1 > o1) & (ci < oi) & (oi >= c1) & (ci <= o1)
+        # Tweezers: |diff| / price <= tolerance, cross-multiplied for positive prices
+        out[12, col] = (li > 0) & (abs(li - l1) <= li * TWEEZER_TOLERANCE) & (c1 < o1) & (ci > oi)
+        out[13, col] = (hi > 0) & (abs(hi - h1) <= hi * TWEEZER_TOLERANCE) & (c1 > o1) & (ci < oi)
+        # Harami: the sign tests fix both bodies, so no abs is needed
+        out[14, col] = (move1 < 0) & (-move1 > move * 2) & (move > 0) & (oi >= c1) & (ci <= o1)
+        out[15, col] = (move1 > 0) & (move1 > -move * 2) & (move < 0) & (oi <= c1) & (ci >= o1)
+    else:
+        out[0, col] = 0
+        out[1, col] = 0
+        for k in range(10, 16):
+            out[k, col] = 0
+
+    # Three-bar patterns, gated on the current bar's direction so the
+    # earlier bars are only read for the patterns that can still match
+    for k in range(16, 20):
+        out[k, col] = 0
+    if i >= 2:
+        if ci > oi:
+            o2 = o[i - 2]
+            c2 = c[i - 2]
+            if c2 < o2:
+                body2 = o2 - c2
+                out[16, col] = (abs(c[i - 1] - o[i - 1]) < body2 * 0.3) & (body > body2 * 0.5)
+            else:
+                c1 = c[i - 1]
+                out[18, col] = (c2 > o2) & (c1 > o[i - 1]) & (ci > c1) & (c1 > c2)
+        elif ci < oi:
+            o2 = o[i - 2]
+            c2 = c[i - 2]
+            if c2 > o2:
+                body2 = c2 - o2
+                out[17, col] = (abs(c[i - 1] - o[i - 1]) < body2 * 0.3) & (body > body2 * 0.5)
+            else:
+                c1 = c[i - 1]
+                out[19, col] = (c2 < o2) & (c1 < o[i - 1]) & (ci < c1) & (c1 < c2)
+
+    # Breakout patterns (extremes of the previous lookback bars; NaN when
+    # there is not enough history, which compares False)
+    out[20, col] = ci > prev_high_20
+    out[21, col] = ci < prev_low_20
+    out[22, col] = ci > prev_high_10
+    out[23, col] = ci < prev_low_10
+
+    # Range patterns (average range of the previous RANGE_PERIOD bars)
+    if i >= RANGE_PERIOD:
+        total = 0.0
+        for j in range(i - RANGE_PERIOD, i):
+            total += h[j] - l[j]
+        out[24, col] = rng > total / RANGE_PERIOD * RANGE_THRESHOLD
+    else:
+        out[24, col] = 0
+
+
+@njit(types.void(_f8_in, _f8_in, _f8_in, _f8_in, _f8_in, _f8_in, _f8_in, _f8_in, _u1_out_2d),
+      parallel=True, cache=True, error_model='numpy')
+def _detect_all(o, h, l, c, high_20, low_20, high_10, low_10, out):
+    """
+    Evaluate all patterns for every bar
+
+    Parameters:
+    -----------
+    o, h, l, c : float64 arrays
+        OHLC columns
+    high_20, low_20, high_10, low_10 : float64 arrays
+        Rolling 20/10-bar high and low ending at each bar (from _rolling_extreme)
+    out : uint8 array of shape (len(PATTERN_NAMES), n)
+        Receives 1 where a pattern occurs, 0 otherwise
+    """
+    n = c.shape[0]
+
+    for i in prange(n):
+        if i >= 1:
+            _bar_patterns(o, h, l, c, i, high_20[i - 1], low_20[i - 1],
+                          high_10[i - 1], low_10[i - 1], out, i)
+        else:
+            _bar_patterns(o, h, l, c, i, np.nan, np.nan, np.nan, np.nan, out, i)
+
+
+@njit(cache=True)
+def _window_extreme(a, end, window, is_max):
+    """Max (is_max) or min of a[end - window + 1:end + 1]; NaN if short or NaN-containing"""
+    if end < window - 1:
+        return np.nan
+    best = a[end]
+    for j in range(end - window + 1, end + 1):
+        x = a[j]
+        if np.isnan(x):
+            return np.nan
+        if (x > best) if is_max else (x < best):
+            best = x
+    return best
+
+
+@njit(types.void(_f8_in, _f8_in, _f8_in, _f8_in, types.int64, _u1_out_2d),
+      cache=True, error_model='numpy')
+def _detect_tail(o, h, l, c, start, out):
+    """
+    Evaluate all patterns for bars start..n-1 only, into out[:, i - start]
+
+    Each bar reads at most the 20 bars before it, so the cost is independent
+    of the history length.
+    """
+    n = c.shape[0]
+
+    for i in range(start, n):
+        _bar_patterns(o, h, l, c, i,
+                      _window_extreme(h, i - 1, 20, True), _window_extreme(l, i - 1, 20, False),
+                      _window_extreme(h, i - 1, 10, True), _window_extreme(l, i - 1, 10, False),
+                      out, i - start)
+
+
+@njit(types.void(_f8_in, _f8_in, _f8_in, _f8_in, _f8_in, _f8_in, _i1_out_2d),
+      parallel=True, cache=True, error_model='numpy')
+def _simple_patterns(o, h, l, c, high_20, range_sma, out):
+    """
+    Evaluate the simple Yahoo backtest patterns for every bar
+
+    Parameters:
+    -----------
+    o, h, l, c : float64 arrays
+        OHLC columns
+    high_20 : float64 array
+        Rolling 20-bar high ending at each bar (from _rolling_extreme)
+    range_sma : float64 array
+        10-bar mean of the high-low range ending at each bar
+    out : int8 array of shape (len(SIMPLE_PATTERN_NAMES), n)
+        Receives 1 where a pattern occurs, 0 otherwise
+    """
+    n = c.shape[0]
+
+    for i in prange(n):
+        oi = o[i]
+        hi = h[i]
+        li = l[i]
+        ci = c[i]
+
+        # fmin/fmax skip a missing open or close like DataFrame.min/max(axis=1)
+        body = abs(ci - oi)
+        lower_shadow = np.fmin(oi, ci) - li
+        upper_shadow = hi - np.fmax(oi, ci)
+        rng = hi - li
+
+        # Doji as body < 0.1 * range rather than body / range < 0.1: the same
+        # for zero ranges (never a doji) without dividing
+        out[0, i] = body < SIMPLE_DOJI_THRESHOLD * rng
+        out[1, i] = (lower_shadow > 2 * body) & (upper_shadow < body) & (ci > oi)
+        out[4, i] = rng > range_sma[i] * SIMPLE_RANGE_THRESHOLD
+        if i >= 1:
+            out[2, i] = ci > h[i - 1] * SIMPLE_BREAKOUT_MARGIN
+            out[3, i] = ci > high_20[i - 1]
+            out[5, i] = (hi < h[i - 1]) & (li > l[i - 1])
+        else:
+            out[2, i] = 0
+            out[3, i] = 0
+            out[5, i] = 0
@@ -7,6 +7,7 @@ import numpy as np
 from typing import Dict, List, Callable, Optional, Tuple
 from dataclasses import dataclass
 from utils import get_logger, create_summary_stats
+from _backtest_loops import _run_backtest_njit, EXIT_REASONS
 
 logger = get_logger(__name__)
 
@@ -29,6 +30,15 @@ class Trade:
     mae: Optional[float] = None  # Maximum Adverse Excursion
     mfe: Optional[float] = None  # Maximum Favorable Excursion
 
+@dataclass
+class TradesArrays:
+    """Per-trade results as parallel NumPy arrays (no per-trade Python objects)"""
+    pnl: np.ndarray
+    bars_held: np.ndarray
+    mae: np.ndarray
+    mfe: np.ndarray
+    exit_reason: np.ndarray  # codes indexing _backtest_loops.EXIT_REASONS
+
 class BacktestEngine:
     """
     Universal backtesting engine for pattern-based strategies
@@ -74,99 +84,53 @@ class BacktestEngine:
         self.atr_column = atr_column
         
         self.trades: List[Trade] = []
-        self.in_trade = False
-        self.current_trade: Optional[Trade] = None
         
-    def calculate_stop_and_target(self, idx: int) -> Tuple[float, float]:
-        """Calculate stop loss and take profit levels"""
-        entry_price = self.df.loc[idx, 'close']
-        atr = self.df.loc[idx, self.atr_column]
+    def _simulate(self) -> Tuple[np.ndarray, ...]:
+        """Evaluate entry signals and simulate trades in the compiled kernel"""
+        # Get entry signals
+        entry_signals = self.entry_conditions(self.df)
+        
+        # Ensure entry_signals is a Series with same index as df
+        if not isinstance(entry_signals, pd.Series):
+            entry_signals = pd.Series(entry_signals, index=self.df.index)
+        
+        logger.info(f"Found {entry_signals.sum()} potential entry signals")
+        
+        entries = np.flatnonzero(entry_signals.to_numpy(dtype=bool))
         
-        if self.direction == 'long':
-            stop_loss = entry_price - (self.stop_loss_atr * atr)
-            take_profit = entry_price + (self.take_profit_atr * atr)
-        else:  # short
-            stop_loss = entry_price + (self.stop_loss_atr * atr)
-            take_profit = entry_price - (self.take_profit_atr * atr)
-            
-        return stop_loss, take_profit
+        # Keep float32 (quantized) price data in single precision
+        dtype = np.float32 if self.df['close'].dtype == np.float32 else np.float64
+        return _run_backtest_njit(
+            entries,
+            self.df['high'].to_numpy(dtype=dtype),
+            self.df['low'].to_numpy(dtype=dtype),
+            self.df['close'].to_numpy(dtype=dtype),
+            self.df[self.atr_column].to_numpy(dtype=dtype),
+            float(self.stop_loss_atr),
+            float(self.take_profit_atr),
+            np.int64(-1 if self.max_hold_bars is None else self.max_hold_bars),
+            np.int8(1 if self.direction == 'long' else -1),
+            bool(self.breakeven_at_tp1)
+        )
     
-    def check_exit(self, idx: int) -> Tuple[bool, Optional[str], Optional[float]]:
+    def run_arrays(self) -> TradesArrays:
         """
-        Check if current trade should be exited
+        Run the backtest without building Trade objects or a DataFrame
         
         Returns:
         --------
-        Tuple of (should_exit, exit_reason, exit_price)
+        TradesArrays with pnl, bars_held, mae, mfe and exit_reason per trade
         """
-        if not self.in_trade or self.current_trade is None:
-            return False, None, None
-        
-        high = self.df.loc[idx, 'high']
-        low = self.df.loc[idx, 'low']
-        close = self.df.loc[idx, 'close']
-        
-        bars_held = idx - self.current_trade.entry_idx
-        
-        # Check time-based exit
-        if self.max_hold_bars is not None and bars_held >= self.max_hold_bars:
-            return True, 'time_exit', close
+        (entry_idx, exit_idx, stops, targets, exit_prices,
+         pnl, mae, mfe, reasons) = self._simulate()
         
-        if self.direction == 'long':
-            # Check stop loss
-            if low <= self.current_trade.stop_loss:
-                return True, 'stop_loss', self.current_trade.stop_loss
-            
-            # Check take profit
-            if high >= self.current_trade.take_profit:
-                return True, 'take_profit', self.current_trade.take_profit
-            
-            # Check breakeven
-            if self.breakeven_at_tp1:
-                tp1 = self.current_trade.entry_price + (
-                    (self.current_trade.take_profit - self.current_trade.entry_price) / 2
-                )
-                if high >= tp1 and self.current_trade.stop_loss < self.current_trade.entry_price:
-                    self.current_trade.stop_loss = self.current_trade.entry_price
-                    
-        else:  # short
-            # Check stop loss
-            if high >= self.current_trade.stop_loss:
-                return True, 'stop_loss', self.current_trade.stop_loss
-            
-            # Check take profit
-            if low <= self.current_trade.take_profit:
-                return True, 'take_profit', self.current_trade.take_profit
-            
-            # Check breakeven
-            if self.breakeven_at_tp1:
-                tp1 = self.current_trade.entry_price - (
-                    (self.current_trade.entry_price - self.current_trade.take_profit) / 2
-                )
-                if low <= tp1 and self.current_trade.stop_loss > self.current_trade.entry_price:
-                    self.current_trade.stop_loss = self.current_trade.entry_price
-        
-        return False, None, None
-    
-    def calculate_mae_mfe(self, trade: Trade) -> Tuple[float, float]:
-        """Calculate Maximum Adverse and Favorable Excursion"""
-        if trade.exit_idx is None:
-            return 0.0, 0.0
-        
-        trade_slice = self.df.loc[trade.entry_idx:trade.exit_idx]
-        
-        if self.direction == 'long':
-            # MAE: worst drawdown (lowest low relative to entry)
-            mae = ((trade_slice['low'].min() - trade.entry_price) / trade.entry_price) * 100
-            # MFE: best profit (highest high relative to entry)
-            mfe = ((trade_slice['high'].max() - trade.entry_price) / trade.entry_price) * 100
-        else:  # short
-            # MAE: worst drawdown (highest high relative to entry)
-            mae = ((trade.entry_price - trade_slice['high'].max()) / trade.entry_price) * 100
-            # MFE: best profit (lowest low relative to entry)
-            mfe = ((trade.entry_price - trade_slice['low'].min()) / trade.entry_price) * 100
-        
-        return mae, mfe
+        return TradesArrays(
+            pnl=pnl,
+            bars_held=exit_idx - entry_idx,
+            mae=mae,
+            mfe=mfe,
+            exit_reason=reasons
+        )
     
     def run(self) -> pd.DataFrame:
         """
@@ -178,94 +142,33 @@ class BacktestEngine:
         """
         logger.info(f"Running backtest ({self.direction}) with {len(self.df)} bars...")
         
-        # Get entry signals
-        entry_signals = self.entry_conditions(self.df)
-        
-        # Ensure entry_signals is a Series with same index as df
-        if not isinstance(entry_signals, pd.Series):
-            entry_signals = pd.Series(entry_signals, index=self.df.index)
-        
-        logger.info(f"Found {entry_signals.sum()} potential entry signals")
-        
-        # Main loop
-        for idx in range(len(self.df)):
-            # Check for exit if in trade
-            if self.in_trade:
-                should_exit, exit_reason, exit_price = self.check_exit(idx)
-                
-                if should_exit and self.current_trade is not None:
-                    # Close trade
-                    self.current_trade.exit_idx = idx
-                    self.current_trade.exit_time = self.df.loc[idx, 'time']
-                    self.current_trade.exit_price = exit_price
-                    self.current_trade.exit_reason = exit_reason
-                    self.current_trade.bars_held = idx - self.current_trade.entry_idx
-                    
-                    # Calculate PnL
-                    if self.direction == 'long':
-                        self.current_trade.pnl = exit_price - self.current_trade.entry_price
-                    else:
-                        self.current_trade.pnl = self.current_trade.entry_price - exit_price
-                    
-                    self.current_trade.pnl_pct = (
-                        self.current_trade.pnl / self.current_trade.entry_price
-                    ) * 100
-                    
-                    # Calculate MAE/MFE
-                    mae, mfe = self.calculate_mae_mfe(self.current_trade)
-                    self.current_trade.mae = mae
-                    self.current_trade.mfe = mfe
-                    
-                    # Store trade
-                    self.trades.append(self.current_trade)
-                    
-                    # Reset state
-                    self.in_trade = False
-                    self.current_trade = None
-            
-            # Check for new entry if not in trade
-            if not self.in_trade and entry_signals.iloc[idx]:
-                # Enter trade
-                stop_loss, take_profit = self.calculate_stop_and_target(idx)
-                
-                self.current_trade = Trade(
-                    entry_idx=idx,
-                    entry_time=self.df.loc[idx, 'time'],
-                    entry_price=self.df.loc[idx, 'close'],
-                    direction=self.direction,
-                    stop_loss=stop_loss,
-                    take_profit=take_profit
-                )
-                
-                self.in_trade = True
+        (entry_idx, exit_idx, stops, targets, exit_prices,
+         pnl, mae, mfe, reasons) = self._simulate()
         
-        # Close any open trade at end
-        if self.in_trade and self.current_trade is not None:
-            idx = len(self.df) - 1
-            self.current_trade.exit_idx = idx
-            self.current_trade.exit_time = self.df.loc[idx, 'time']
-            self.current_trade.exit_price = self.df.loc[idx, 'close']
-            self.current_trade.exit_reason = 'end_of_data'
-            self.current_trade.bars_held = idx - self.current_trade.entry_idx
-            
-            if self.direction == 'long':
-                self.current_trade.pnl = (
-                    self.current_trade.exit_price - self.current_trade.entry_price
-                )
-            else:
-                self.current_trade.pnl = (
-                    self.current_trade.entry_price - self.current_trade.exit_price
-                )
-            
-            self.current_trade.pnl_pct = (
-                self.current_trade.pnl / self.current_trade.entry_price
-            ) * 100
-            
-            mae, mfe = self.calculate_mae_mfe(self.current_trade)
-            self.current_trade.mae = mae
-            self.current_trade.mfe = mfe
-            
-            self.trades.append(self.current_trade)
+        times = self.df['time']
+        close = self.df['close']
+        for k in range(len(entry_idx)):
+            entry = int(entry_idx[k])
+            exit_ = int(exit_idx[k])
+            entry_price = close.iat[entry]
+            trade = Trade(
+                entry_idx=entry,
+                entry_time=times.iat[entry],
+                entry_price=entry_price,
+                direction=self.direction,
+                stop_loss=float(stops[k]),
+                take_profit=float(targets[k]),
+                exit_idx=exit_,
+                exit_time=times.iat[exit_],
+                exit_price=float(exit_prices[k]),
+                exit_reason=EXIT_REASONS[reasons[k]],
+                pnl=float(pnl[k]),
+                pnl_pct=float(pnl[k]) / entry_price * 100,
+                bars_held=exit_ - entry,
+                mae=float(mae[k]),
+                mfe=float(mfe[k])
+            )
+            self.trades.append(trade)
         
         logger.info(f"Backtest complete: {len(self.trades)} trades executed")
         
@@ -5,130 +5,274 @@ Grid search optimization for pattern-based strategies with multiprocessing suppo
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple, Optional
-from itertools import product
-from multiprocessing import Pool, cpu_count
+import multiprocessing
+from multiprocessing import cpu_count
 import time
+import hashlib
+from collections import Counter, deque
+from functools import lru_cache
+from numba import set_num_threads
+from operator import itemgetter
 from pathlib import Path
 
-from utils import load_features, get_logger, create_summary_stats
-from backtest_engine import BacktestEngine
-from strategy_builder import create_pattern_strategy, get_default_patterns
+from utils import load_features, get_logger
+from _backtest_loops import (
+    _backtest_and_summarize, REASON_NO_TRADES, REASON_INSUFFICIENT_TRADES,
+    REASON_PF_FAIL, REASON_DD_FAIL, REASON_ERROR, REASON_NAMES, PASSED, _and_rows
+)
+from strategy_builder import create_pattern_strategy
 from config import get_config
 
 logger = get_logger(__name__)
 
+# Grid parameters in the order generate_parameter_grid expands them
+PARAM_NAMES = ['stop_loss_atr', 'take_profit_atr', 'max_hold_bars', 'trend_condition',
+               'rsi_min', 'adx_min', 'atr_min', 'atr_max', 'ema_proximity', 'volume_min']
+
+# Price, ATR and filter columns quantized to float32 for the backtest workers
+FLOAT32_COLUMNS = ['open', 'high', 'low', 'close', 'atr_14', 'ema_20', 'ema_50', 'rsi_14',
+                   'adx_14', 'atr_pct_14', 'dist_ema20', 'volume_ratio']
+
+_param_values = itemgetter(*PARAM_NAMES)
+
+# Entry filters accepted by create_pattern_strategy
+FILTER_KEYS = ['trend_condition', 'rsi_min', 'rsi_max', 'adx_min', 'atr_min',
+               'atr_max', 'ema_proximity', 'volume_min']
+
+# Row layout of a passing combination: grid parameters (None stored as NaN) followed by metrics
+RESULT_DTYPE = np.dtype([
+    ('stop_loss_atr', 'f8'),
+    ('take_profit_atr', 'f8'),
+    ('max_hold_bars', 'f8'),
+    ('trend_condition', 'O'),
+    ('rsi_min', 'f8'),
+    ('adx_min', 'f8'),
+    ('atr_min', 'f8'),
+    ('atr_max', 'f8'),
+    ('ema_proximity', 'f8'),
+    ('volume_min', 'f8'),
+    ('trades', 'i8'),
+    ('win_rate', 'f8'),
+    ('profit_factor', 'f8'),
+    ('max_dd_pct', 'f8'),
+    ('total_pnl', 'f8'),
+    ('avg_pnl_per_trade', 'f8'),
+    ('avg_bars_held', 'f8'),
+    ('avg_mae', 'f8'),
+    ('avg_mfe', 'f8')
+])
+
+# Example diagnostics kept per failure reason (all failures are counted)
+DIAGNOSTIC_SAMPLES = 10
+
+# Modules imported once by the forkserver so new workers start with them loaded
+_FORKSERVER_PRELOAD = ['numpy', 'pandas', 'numba', '_backtest_loops']
+
+def _get_pool_context():
+    """Multiprocessing context for worker pools (forkserver where the platform supports it)"""
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context('forkserver')
+        ctx.set_forkserver_preload(_FORKSERVER_PRELOAD)
+        return ctx
+    return multiprocessing.get_context()
+
 # Global variables for multiprocessing worker initialization
 _worker_df = None
 _worker_pattern = None
 _worker_direction = None
+_worker_param_grid = None
+
+# Price/ATR columns and direction in the form the backtest kernel takes them
+_worker_high = None
+_worker_low = None
+_worker_close = None
+_worker_atr = None
+_worker_direction_sign = np.int8(1)
+_worker_min_trades = 10
+_worker_min_pf = 1.25
+_worker_max_dd = 15.0
 
-def _worker_init(df: pd.DataFrame, pattern: str, direction: str):
-    """Initialize worker process with shared data"""
-    global _worker_df, _worker_pattern, _worker_direction
+# Packed (np.packbits) entry masks stacked one per row: the pattern alone and the
+# pattern with each single filter value. Rows are looked up by (filter, value);
+# (None, None) is the pattern. The table is preallocated and doubled when full,
+# so only the first len(_worker_filter_rows) rows are filled.
+_worker_filter_table = None
+_worker_filter_rows = {}
+
+# Summary tuples keyed by (entry mask hash, stop_loss_atr, take_profit_atr, max_hold_bars).
+# Filter combinations that select the same entry bars share one backtest.
+_worker_cache = {}
+
+def _worker_init(
+    df: pd.DataFrame,
+    pattern: str,
+    direction: str,
+    min_trades: int,
+    min_pf: float,
+    max_dd: float,
+    param_grid: Optional[List[Dict]] = None
+):
+    """Initialize worker process with shared data and filter thresholds"""
+    global _worker_df, _worker_pattern, _worker_direction, _worker_param_grid, _worker_cache
+    global _worker_filter_table, _worker_filter_rows
+    global _worker_high, _worker_low, _worker_close, _worker_atr, _worker_direction_sign
+    global _worker_min_trades, _worker_min_pf, _worker_max_dd
     _worker_df = df
     _worker_pattern = pattern
     _worker_direction = direction
+    
+    dtype = np.float32 if df['close'].dtype == np.float32 else np.float64
+    _worker_high = df['high'].to_numpy(dtype=dtype)
+    _worker_low = df['low'].to_numpy(dtype=dtype)
+    _worker_close = df['close'].to_numpy(dtype=dtype)
+    _worker_atr = df['atr_14'].to_numpy(dtype=dtype)
+    _worker_direction_sign = np.int8(1 if direction == 'long' else -1)
+    
+    _worker_min_trades = int(min_trades)
+    _worker_min_pf = float(min_pf)
+    _worker_max_dd = float(max_dd)
+    _worker_param_grid = param_grid
+    _worker_filter_table = None
+    _worker_filter_rows = {}
+    _worker_cache = {}
 
-def _evaluate_combination(params: Dict) -> Tuple[Optional[Dict], Optional[Dict]]:
+def _pool_worker_init(*args):
+    """
+    Initialize a pool worker: _worker_init with Numba limited to one thread
+    
+    The pool already runs one worker per core, so the parallel kernels
+    (_and_rows) must not start their own thread pools in each worker.
+    """
+    set_num_threads(1)
+    _worker_init(*args)
+
+def _filter_row(key: Optional[str], value) -> int:
+    """Row of the packed mask table for the pattern with one filter applied, evaluated once per worker"""
+    global _worker_filter_table
+    
+    row = _worker_filter_rows.get((key, value))
+    if row is None:
+        if key is None:
+            entry_func = create_pattern_strategy(_worker_df, _worker_pattern)
+        else:
+            entry_func = create_pattern_strategy(_worker_df, _worker_pattern, **{key: value})
+        bits = np.packbits(np.asarray(entry_func(_worker_df), dtype=bool))
+        
+        row = len(_worker_filter_rows)
+        if _worker_filter_table is None:
+            _worker_filter_table = np.empty((16, len(bits)), dtype=np.uint8)
+        elif row == len(_worker_filter_table):
+            grown = np.empty((2 * row, len(bits)), dtype=np.uint8)
+            grown[:row] = _worker_filter_table
+            _worker_filter_table = grown
+        _worker_filter_table[row] = bits
+        _worker_filter_rows[(key, value)] = row
+    return row
+
+def _evaluate_batch(bounds: Tuple[int, int]) -> Tuple[int, List[Tuple[Optional[Tuple], Optional[Tuple]]]]:
+    """
+    Evaluate the combinations _worker_param_grid[start:end]
+    
+    Tasks only carry the index range; the grid itself is handed to each
+    worker once through _worker_init. The start index is returned so the
+    parent can match rows back to their params.
+    """
+    start, end = bounds
+    return start, [_evaluate_combination(_worker_param_grid[i]) for i in range(start, end)]
+
+def _evaluate_combination(params: Dict) -> Tuple[Optional[Tuple], Optional[Tuple]]:
     """
     Evaluate a single parameter combination
     
     Returns:
     --------
-    Tuple of (result_dict, diagnostic_dict)
-    result_dict: If strategy passes filters, else None
-    diagnostic_dict: Reason for failure if applicable
+    Tuple of (result_row, diagnostic)
+    result_row: Tuple in RESULT_DTYPE order if strategy passes filters, else None
+    diagnostic: (REASON_* code, trades, failing metric or error) if the strategy failed, else None
     """
-    global _worker_df, _worker_pattern, _worker_direction
-    
     try:
-        # Build entry condition
-        entry_func = create_pattern_strategy(
-            df=_worker_df,
-            pattern=_worker_pattern,
-            trend_condition=params.get('trend_condition'),
-            rsi_min=params.get('rsi_min'),
-            rsi_max=params.get('rsi_max'),
-            adx_min=params.get('adx_min'),
-            atr_min=params.get('atr_min'),
-            atr_max=params.get('atr_max'),
-            ema_proximity=params.get('ema_proximity'),
-            volume_min=params.get('volume_min')
+        # Build entry condition as the AND of the pattern/filter bitsets
+        rows = [_filter_row(None, None)]
+        for key in FILTER_KEYS:
+            value = params.get(key)
+            if value is not None:
+                rows.append(_filter_row(key, value))
+        entry_bits = _and_rows(_worker_filter_table, np.array(rows, dtype=np.int64))
+        
+        cache_key = (
+            hashlib.blake2b(entry_bits.tobytes(), digest_size=8).digest(),
+            params['stop_loss_atr'],
+            params['take_profit_atr'],
+            params.get('max_hold_bars')
         )
+        summary = _worker_cache.get(cache_key)
         
-        # Run backtest
-        engine = BacktestEngine(
-            df=_worker_df,
-            entry_conditions=entry_func,
-            direction=_worker_direction,
-            stop_loss_atr=params['stop_loss_atr'],
-            take_profit_atr=params['take_profit_atr'],
-            max_hold_bars=params.get('max_hold_bars')
+        if summary is None:
+            entries = np.flatnonzero(np.unpackbits(entry_bits, count=len(_worker_close)))
+            
+            # Backtest and summarize in one pass; no per-trade arrays are kept
+            max_hold_bars = params.get('max_hold_bars')
+            summary = _backtest_and_summarize(
+                entries, _worker_high, _worker_low, _worker_close, _worker_atr,
+                float(params['stop_loss_atr']),
+                float(params['take_profit_atr']),
+                np.int64(-1 if max_hold_bars is None else max_hold_bars),
+                _worker_direction_sign,
+                False,
+                _worker_min_trades, _worker_min_pf, _worker_max_dd
+            )
+            _worker_cache[cache_key] = summary
+        
+        (reason, total_trades, win_rate, profit_factor, max_dd_pct, total_pnl,
+         avg_pnl, avg_bars_held, avg_mae, avg_mfe) = summary
+        
+        if reason != PASSED:
+            # Failure detail: (reason, trades, failing metric); the parent expands it on demand
+            if reason == REASON_PF_FAIL:
+                return None, (reason, total_trades, profit_factor)
+            if reason == REASON_DD_FAIL:
+                return None, (reason, total_trades, max_dd_pct)
+            return None, (reason, total_trades, None)
+        
+        # Passed all filters - return result row in RESULT_DTYPE order
+        result = _param_values(params) + (
+            total_trades,
+            win_rate,
+            profit_factor,
+            max_dd_pct,
+            total_pnl,
+            avg_pnl,
+            avg_bars_held,
+            avg_mae,
+            avg_mfe
         )
         
-        trades_df = engine.run()
-        
-        if len(trades_df) == 0:
-            return None, {
-                'params': params,
-                'why': 'no_trades',
-                'trades': 0
-            }
-        
-        # Calculate metrics
-        summary = engine.get_summary()
-        
-        # Check filters
-        config = get_config()
-        min_trades = config.get('filters.min_trades', 10)
-        min_pf = config.get('objectives.min_profit_factor', 1.25)
-        max_dd = config.get('objectives.max_drawdown_pct', 15.0)
-        
-        if summary['total_trades'] < min_trades:
-            return None, {
-                'params': params,
-                'why': 'insufficient_trades',
-                'trades': summary['total_trades']
-            }
-        
-        if summary['profit_factor'] < min_pf:
-            return None, {
-                'params': params,
-                'why': 'pf_fail',
-                'pf': summary['profit_factor'],
-                'trades': summary['total_trades']
-            }
-        
-        if summary['max_dd_pct'] > max_dd:
-            return None, {
-                'params': params,
-                'why': 'dd_fail',
-                'dd': summary['max_dd_pct'],
-                'trades': summary['total_trades']
-            }
-        
-        # Passed all filters - return result
-        result = {
-            **params,
-            'trades': summary['total_trades'],
-            'win_rate': summary['win_rate'],
-            'profit_factor': summary['profit_factor'],
-            'max_dd_pct': summary['max_dd_pct'],
-            'total_pnl': summary['total_pnl'],
-            'avg_pnl_per_trade': summary['avg_pnl_per_trade'],
-            'avg_bars_held': summary['avg_bars_held'],
-            'avg_mae': summary['avg_mae'],
-            'avg_mfe': summary['avg_mfe']
-        }
-        
         return result, None
         
     except Exception as e:
-        return None, {
-            'params': params,
-            'why': 'error',
-            'error': str(e)
-        }
+        return None, (REASON_ERROR, None, str(e))
+
+@lru_cache(maxsize=8)
+def _read_optimizer_features(commodity: str, timeframe: str) -> pd.DataFrame:
+    """Load and downcast features for optimization, memoized per (commodity, timeframe)"""
+    df = load_features(commodity, timeframe)
+    
+    # Single precision is ample for SL/TP comparisons and indicator filters,
+    # and halves the data each worker receives
+    for col in FLOAT32_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype(np.float32)
+    
+    return df
+
+def _load_optimizer_features(commodity: str, timeframe: str) -> pd.DataFrame:
+    """
+    Features for optimization, as a copy of the memoized frame
+    
+    Each PatternOptimizer gets its own frame, so changes made by one cannot
+    reach the cache or the other optimizers for the same market.
+    """
+    return _read_optimizer_features(commodity, timeframe).copy()
 
 class PatternOptimizer:
     """
@@ -161,9 +305,9 @@ class PatternOptimizer:
         # Load configuration
         self.config = get_config()
         
-        # Load data
+        # Load data (shared between optimizers for the same commodity/timeframe)
         logger.info(f"Loading features for {commodity} {timeframe}...")
-        self.df = load_features(commodity, timeframe)
+        self.df = _load_optimizer_features(self.commodity, self.timeframe)
         
         # Verify pattern exists
         if pattern not in self.df.columns:
@@ -177,7 +321,8 @@ class PatternOptimizer:
             raise ValueError(f"Pattern '{pattern}' never occurs in the data")
         
         self.results = []
-        self.diagnostics = []
+        self.diagnostic_counts = Counter()
+        self.diagnostic_samples = {code: deque(maxlen=DIAGNOSTIC_SAMPLES) for code in range(len(REASON_NAMES))}
         
     def generate_parameter_grid(self) -> List[Dict]:
         """
@@ -209,68 +354,139 @@ class PatternOptimizer:
         else:
             trend_conditions = self.config.get('trend_conditions.bearish', [None, 'ema_20 < ema_50'])
         
-        # Generate all combinations (iterator for memory efficiency)
-        combinations_iterator = product(
-            stop_loss_range,
-            take_profit_range,
-            max_hold_bars_range,
-            trend_conditions,
-            rsi_min_range,
-            adx_min_range,
-            atr_min_range,
-            atr_max_range,
-            ema_proximity_range,
-            volume_ratio_range
-        )
+        ranges = [
+            list(stop_loss_range),
+            list(take_profit_range),
+            list(max_hold_bars_range),
+            list(trend_conditions),
+            list(rsi_min_range),
+            list(adx_min_range),
+            list(atr_min_range),
+            list(atr_max_range),
+            list(ema_proximity_range),
+            list(volume_ratio_range)
+        ]
+        shape = tuple(len(r) for r in ranges)
+        total = int(np.prod(shape))
+        
+        # Numeric views of the knobs used in validity checks (None -> NaN, which never compares true)
+        def _numeric(values):
+            return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+        
+        rsi_min_values = _numeric(rsi_min_range)
+        atr_min_values = _numeric(atr_min_range)
+        atr_max_values = _numeric(atr_max_range)
         
         # Get max combinations limit
         max_combos = self.config.get('filters.max_combinations', 50000)
+        limit = max_combos * 2  # Get 2x, then sample
         
-        # Convert to list of dicts with filtering (limit early for efficiency)
-        param_grid = []
+        # Walk the Cartesian product in product() order, in blocks of flat indices,
+        # so the full grid is never materialized
+        valid_blocks = []
+        num_valid = 0
         total_checked = 0
+        block_size = max(limit, 1 << 16)
         
-        for combo in combinations_iterator:
-            total_checked += 1
+        for block_start in range(0, total, block_size):
+            flat = np.arange(block_start, min(block_start + block_size, total), dtype=np.int64)
+            idx = np.unravel_index(flat, shape)
             
-            params = {
-                'stop_loss_atr': combo[0],
-                'take_profit_atr': combo[1],
-                'max_hold_bars': combo[2],
-                'trend_condition': combo[3],
-                'rsi_min': combo[4],
-                'adx_min': combo[5],
-                'atr_min': combo[6],
-                'atr_max': combo[7],
-                'ema_proximity': combo[8],
-                'volume_min': combo[9]
-            }
-            
-            # Filter out invalid combinations (e.g., atr_min > atr_max)
-            if params['atr_min'] is not None and params['atr_max'] is not None:
-                if params['atr_min'] >= params['atr_max']:
-                    continue
-            
-            # Filter out RSI >= 70 (overbought)
-            if params['rsi_min'] is not None and params['rsi_min'] >= 70:
-                continue
-            
-            param_grid.append(params)
+            # Filter out invalid combinations (atr_min >= atr_max, RSI >= 70 overbought)
+            valid = ~(atr_min_values[idx[6]] >= atr_max_values[idx[7]]) & ~(rsi_min_values[idx[4]] >= 70)
+            valid_flat = flat[valid]
             
             # Stop early if we have enough valid combinations
-            if len(param_grid) >= max_combos * 2:  # Get 2x, then sample
+            if num_valid + len(valid_flat) >= limit:
+                valid_flat = valid_flat[:limit - num_valid]
+                valid_blocks.append(valid_flat)
+                num_valid += len(valid_flat)
+                total_checked = int(valid_flat[-1]) + 1 if len(valid_flat) else block_start
                 break
+            
+            valid_blocks.append(valid_flat)
+            num_valid += len(valid_flat)
+            total_checked = int(flat[-1]) + 1
+        
+        grid_flat = np.concatenate(valid_blocks) if valid_blocks else np.empty(0, dtype=np.int64)
         
-        logger.info(f"Generated {len(param_grid)} valid parameter combinations (checked {total_checked} total)")
+        logger.info(f"Generated {len(grid_flat)} valid parameter combinations (checked {total_checked} total)")
         
         # Randomly sample if we have too many
-        if len(param_grid) > max_combos:
-            logger.info(f"Randomly sampling {max_combos} combinations from {len(param_grid)}")
-            indices = np.random.choice(len(param_grid), size=max_combos, replace=False)
-            param_grid = [param_grid[i] for i in indices]
+        if len(grid_flat) > max_combos:
+            logger.info(f"Randomly sampling {max_combos} combinations from {len(grid_flat)}")
+            rng = np.random.default_rng(self.config.get('filters.sample_seed', 42))
+            # shuffle=False selects the subset without permuting the whole pool
+            indices = rng.choice(len(grid_flat), size=max_combos, replace=False, shuffle=False)
+            grid_flat = grid_flat[indices]
+        
+        # Only the selected combinations are expanded into parameter dicts
+        columns = [
+            [values[i] for i in idx.tolist()]
+            for values, idx in zip(ranges, np.unravel_index(grid_flat, shape))
+        ]
+        param_grid = [dict(zip(PARAM_NAMES, combo)) for combo in zip(*columns)]
         
         return param_grid
     
+    def prune_parameter_grid(self, param_grid: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Drop combinations whose entry signals cannot reach the minimum trade count
+        
+        A backtest opens at most one trade per entry signal, so the number of
+        signal bars is an upper bound on the trade count. Each filter is
+        evaluated once per value on the pattern bars only; a combination's
+        signal count is the popcount of the AND of its filter masks.
+        
+        Parameters:
+        -----------
+        param_grid : List[Dict]
+            Parameter combinations from generate_parameter_grid
+            
+        Returns:
+        --------
+        Tuple of (surviving combinations, (params, diagnostic) for pruned combinations)
+        """
+        min_trades = self.config.get('filters.min_trades', 10)
+        
+        pattern_df = self.df[self.df[self.pattern] == 1]
+        no_filter = np.ones(len(pattern_df), dtype=bool)
+        filter_masks = {}
+        signal_counts = {}
+        
+        surviving = []
+        pruned = []
+        
+        for params in param_grid:
+            combo = tuple(params.get(key) for key in FILTER_KEYS)
+            count = signal_counts.get(combo)
+            
+            if count is None:
+                mask = no_filter
+                for key, value in zip(FILTER_KEYS, combo):
+                    if value is None:
+                        continue
+                    value_mask = filter_masks.get((key, value))
+                    if value_mask is None:
+                        entry_func = create_pattern_strategy(pattern_df, self.pattern, **{key: value})
+                        value_mask = np.asarray(entry_func(pattern_df), dtype=bool)
+                        filter_masks[(key, value)] = value_mask
+                    mask = mask & value_mask
+                count = int(np.count_nonzero(mask))
+                signal_counts[combo] = count
+            
+            if count >= min_trades:
+                surviving.append(params)
+            elif count == 0:
+                pruned.append((params, (REASON_NO_TRADES, 0, None)))
+            else:
+                pruned.append((params, (REASON_INSUFFICIENT_TRADES, count, None)))
+        
+        logger.info(f"Pruned {len(pruned)} combinations with fewer than {min_trades} entry signals "
+                   f"({len(signal_counts)} unique filter sets)")
+        
+        return surviving, pruned
+    
     def optimize(self, use_multiprocessing: bool = True) -> pd.DataFrame:
         """
         Run optimization
@@ -290,13 +506,23 @@ class PatternOptimizer:
         logger.info(f"{'='*70}")
         
         param_grid = self.generate_parameter_grid()
+        param_grid, pruned = self.prune_parameter_grid(param_grid)
+        for params, diag in pruned:
+            self._record_diagnostic(params, diag)
         
         if len(param_grid) == 0:
             logger.error("No parameter combinations to test")
+            self._print_diagnostic_summary()
             return pd.DataFrame()
         
         start_time = time.time()
         
+        filter_args = (
+            self.config.get('filters.min_trades', 10),
+            self.config.get('objectives.min_profit_factor', 1.25),
+            self.config.get('objectives.max_drawdown_pct', 15.0)
+        )
+        
         if use_multiprocessing:
             num_processes = self.config.get('optimization.num_processes')
             if num_processes is None:
@@ -307,26 +533,45 @@ class PatternOptimizer:
             logger.info(f"Using multiprocessing with {num_processes} processes")
             logger.info(f"Testing {len(param_grid)} combinations...")
             
-            with Pool(
+            # Each task is an index range into the grid held by the workers
+            batches = [(start, min(start + chunk_size, len(param_grid)))
+                       for start in range(0, len(param_grid), chunk_size)]
+            
+            # Pool (rather than ProcessPoolExecutor) for imap_unordered, which
+            # streams batches back as workers finish them
+            with _get_pool_context().Pool(
                 processes=num_processes,
-                initializer=_worker_init,
-                initargs=(self.df, self.pattern, self.direction)
+                initializer=_pool_worker_init,
+                initargs=(self.df, self.pattern, self.direction, *filter_args, param_grid)
             ) as pool:
-                results = pool.map(_evaluate_combination, param_grid, chunksize=chunk_size)
-            
-            # Separate results and diagnostics
-            for result, diag in results:
-                if result is not None:
-                    self.results.append(result)
-                if diag is not None:
-                    self.diagnostics.append(diag)
+                # Stream results as they complete instead of materializing them all.
+                # Batches arriving early wait in pending so results and diagnostics
+                # are recorded in grid order, as in the sequential run.
+                done = 0
+                pending = {}
+                next_start = 0
+                for batch_start, batch in pool.imap_unordered(_evaluate_batch, batches):
+                    pending[batch_start] = batch
+                    while next_start in pending:
+                        ready = pending.pop(next_start)
+                        for offset, (result, diag) in enumerate(ready):
+                            if result is not None:
+                                self.results.append(result)
+                            if diag is not None:
+                                self._record_diagnostic(param_grid[next_start + offset], diag)
+                        next_start += len(ready)
+                    
+                    if (done + len(batch)) // 1000 > done // 1000:
+                        logger.info(f"Progress: {done + len(batch)}/{len(param_grid)} "
+                                   f"({(done + len(batch))/len(param_grid)*100:.1f}%)")
+                    done += len(batch)
         
         else:
             # Sequential processing
             logger.info(f"Running sequential optimization...")
             logger.info(f"Testing {len(param_grid)} combinations...")
             
-            _worker_init(self.df, self.pattern, self.direction)
+            _worker_init(self.df, self.pattern, self.direction, *filter_args)
             
             for i, params in enumerate(param_grid):
                 if i % 100 == 0:
@@ -337,7 +582,7 @@ class PatternOptimizer:
                 if result is not None:
                     self.results.append(result)
                 if diag is not None:
-                    self.diagnostics.append(diag)
+                    self._record_diagnostic(params, diag)
         
         elapsed = time.time() - start_time
         
@@ -350,14 +595,15 @@ class PatternOptimizer:
             self._print_diagnostic_summary()
             return pd.DataFrame()
         
-        # Convert to DataFrame and sort
-        results_df = pd.DataFrame(self.results)
-        
         # Sort by: trades (desc), PF (desc), Win Rate (desc), DD (asc)
-        results_df = results_df.sort_values(
-            ['trades', 'profit_factor', 'win_rate', 'max_dd_pct'],
-            ascending=[False, False, False, True]
-        ).reset_index(drop=True)
+        results = np.array(self.results, dtype=RESULT_DTYPE)
+        order = np.lexsort((
+            results['max_dd_pct'],
+            -results['win_rate'],
+            -results['profit_factor'],
+            -results['trades']
+        ))
+        results_df = pd.DataFrame(results[order])
         
         logger.info(f"\nTop 3 Results:")
         for i in range(min(3, len(results_df))):
@@ -367,19 +613,33 @@ class PatternOptimizer:
         
         return results_df
     
+    def _record_diagnostic(self, params: Dict, diag: Tuple):
+        """Count a failed combination and keep it as an example if among the latest few"""
+        code, trades, value = diag
+        self.diagnostic_counts[code] += 1
+        
+        detail = {'params': params, 'why': REASON_NAMES[code]}
+        if code == REASON_ERROR:
+            detail['error'] = value
+        else:
+            if code == REASON_PF_FAIL:
+                detail['pf'] = value
+            elif code == REASON_DD_FAIL:
+                detail['dd'] = value
+            detail['trades'] = trades
+        self.diagnostic_samples[code].append(detail)
+    
     def _print_diagnostic_summary(self):
         """Print summary of why combinations failed"""
-        if len(self.diagnostics) == 0:
+        total = sum(self.diagnostic_counts.values())
+        if total == 0:
             return
         
-        diag_df = pd.DataFrame(self.diagnostics)
-        
         logger.info("\nDiagnostic Summary:")
-        reason_counts = diag_df['why'].value_counts()
         
-        for reason, count in reason_counts.items():
-            pct = count / len(self.diagnostics) * 100
-            logger.info(f"  {reason:20s}: {count:6d} ({pct:5.1f}%)")
+        for code, count in self.diagnostic_counts.most_common():
+            pct = count / total * 100
+            logger.info(f"  {REASON_NAMES[code]:20s}: {count:6d} ({pct:5.1f}%)")
     
     def save_results(self, output_dir: str = "reports/optimization"):
         """Save optimization results"""
@@ -391,7 +651,7 @@ class PatternOptimizer:
         output_path.mkdir(parents=True, exist_ok=True)
         
         # Save results
-        results_df = pd.DataFrame(self.results)
+        results_df = pd.DataFrame(np.array(self.results, dtype=RESULT_DTYPE))
         pattern_clean = self.pattern.replace('pattern_', '')
         filename = f"{pattern_clean}_{self.direction}_optimization.csv"
         filepath = output_path / filename
@@ -399,9 +659,10 @@ class PatternOptimizer:
         results_df.to_csv(filepath, index=False)
         logger.info(f"Saved results to {filepath}")
         
-        # Save diagnostics
-        if len(self.diagnostics) > 0:
-            diag_df = pd.DataFrame(self.diagnostics)
+        # Save example diagnostics
+        samples = [detail for code in sorted(self.diagnostic_samples) for detail in self.diagnostic_samples[code]]
+        if len(samples) > 0:
+            diag_df = pd.DataFrame(samples)
             diag_filename = f"{pattern_clean}_{self.direction}_diagnostics.csv"
             diag_filepath = output_path / diag_filename
             diag_df.to_csv(diag_filepath, index=False)
@@ -1,82 +1,145 @@
 """
 Candlestick Pattern Detection Module
 Detects all major candlestick patterns across multiple timeframes
+
+Detectors take a SharedArrays bundle (OHLC arrays plus body, range and wicks,
+computed once by shared_arrays) and return np.uint8 arrays with 1 where the
+pattern occurs. Bars without enough history are 0.
+
+The rules are this module's own fixed-ratio definitions. TA-Lib's CDL*
+functions of the same names judge bodies and shadows against rolling averages
+of recent candles and flag different bars, so they are not drop-in replacements.
 """
+import hashlib
+from collections import OrderedDict
 import pandas as pd
 import numpy as np
-from typing import Dict
+from typing import Dict, NamedTuple
+
+from _pattern_kernels import _detect_all, _detect_tail, _rolling_extreme, PATTERN_NAMES, MAX_LOOKBACK
+
+# Bit-packed pattern column (see detect_all_patterns_packed); bit i is PATTERN_NAMES[i]
+PACKED_PATTERN_COLUMN = 'patterns_packed'
+PATTERN_BITS = {name: bit for bit, name in enumerate(PATTERN_NAMES)}
+
+# Pattern matrices of recently seen OHLC data, keyed by a hash of the OHLC bytes
+PATTERN_CACHE_SIZE = 8
+_pattern_cache = OrderedDict()
+
+class SharedArrays(NamedTuple):
+    """OHLC arrays and the candle measures reused across detectors"""
+    o: np.ndarray
+    h: np.ndarray
+    l: np.ndarray
+    c: np.ndarray
+    move: np.ndarray        # close - open (signed body)
+    body: np.ndarray        # |close - open|
+    range: np.ndarray       # high - low
+    lower_wick: np.ndarray  # min(open, close) - low
+    upper_wick: np.ndarray  # high - max(open, close)
+
+def shared_arrays(df: pd.DataFrame) -> SharedArrays:
+    """
+    Extract OHLC as float64 arrays and compute body, range and wicks once
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        OHLC dataframe
+        
+    Returns:
+    --------
+    SharedArrays for the detect_* functions
+    """
+    o, h, l, c = (df[k].to_numpy(dtype=np.float64) for k in ('open', 'high', 'low', 'close'))
+    move = c - o
+    
+    return SharedArrays(
+        o=o,
+        h=h,
+        l=l,
+        c=c,
+        move=move,
+        body=np.abs(move),
+        range=h - l,
+        # fmin/fmax skip a missing open or close like DataFrame.min/max(axis=1)
+        lower_wick=np.fmin(o, c) - l,
+        upper_wick=h - np.fmax(o, c)
+    )
 
-def detect_inside_bar(df: pd.DataFrame) -> pd.Series:
+def detect_inside_bar(s: SharedArrays) -> np.ndarray:
     """
     Inside Bar: Current bar's high/low completely within previous bar's range
     Indicates consolidation, often precedes breakout
     
     Returns:
     --------
-    pd.Series with 1 for inside bar, 0 otherwise
+    np.ndarray (uint8) with 1 for inside bar, 0 otherwise
     """
-    inside = (
-        (df['high'] < df['high'].shift(1)) & 
-        (df['low'] > df['low'].shift(1))
-    ).astype(int)
+    h, l, c = s.h, s.l, s.c
+    inside = np.zeros(len(c), dtype=np.uint8)
+    inside[1:] = (h[1:] < h[:-1]) & (l[1:] > l[:-1])
     
     return inside
 
-def detect_outside_bar(df: pd.DataFrame) -> pd.Series:
+def detect_outside_bar(s: SharedArrays) -> np.ndarray:
     """
     Outside Bar (Engulfing Range): Current bar completely engulfs previous bar
     Indicates volatility expansion and potential reversal/continuation
     
     Returns:
     --------
-    pd.Series with 1 for outside bar, 0 otherwise
+    np.ndarray (uint8) with 1 for outside bar, 0 otherwise
     """
-    outside = (
-        (df['high'] > df['high'].shift(1)) & 
-        (df['low'] < df['low'].shift(1))
-    ).astype(int)
+    h, l, c = s.h, s.l, s.c
+    outside = np.zeros(len(c), dtype=np.uint8)
+    outside[1:] = (h[1:] > h[:-1]) & (l[1:] < l[:-1])
     
     return outside
 
-def detect_bullish_engulfing(df: pd.DataFrame) -> pd.Series:
+def detect_bullish_engulfing(s: SharedArrays) -> np.ndarray:
     """
     Bullish Engulfing: Bullish candle completely engulfs previous bearish candle
     Strong bullish reversal signal
     
     Returns:
     --------
-    pd.Series with 1 for bullish engulfing, 0 otherwise
-    """
-    prev_bearish = df['close'].shift(1) < df['open'].shift(1)
-    curr_bullish = df['close'] > df['open']
-    
-    engulfing = (
-        prev_bearish &
-        curr_bullish &
-        (df['open'] <= df['close'].shift(1)) &
-        (df['close'] >= df['open'].shift(1))
-    ).astype(int)
+    np.ndarray (uint8) with 1 for bullish engulfing, 0 otherwise
+    """
+    o, c = s.o, s.c
+    prev_o, prev_c = o[:-1], c[:-1]
+    curr_o, curr_c = o[1:], c[1:]
+    
+    engulfing = np.zeros(len(c), dtype=np.uint8)
+    engulfing[1:] = (
+        (prev_c < prev_o) &
+        (curr_c > curr_o) &
+        (curr_o <= prev_c) &
+        (curr_c >= prev_o)
+    )
     
     return engulfing
 
-def detect_bearish_engulfing(df: pd.DataFrame) -> pd.Series:
+def detect_bearish_engulfing(s: SharedArrays) -> np.ndarray:
     """
     Bearish Engulfing: Bearish candle completely engulfs previous bullish candle
     Strong bearish reversal signal
     """
-    prev_bullish = df['close'].shift(1) > df['open'].shift(1)
-    curr_bearish = df['close'] < df['open']
+    o, c = s.o, s.c
+    prev_o, prev_c = o[:-1], c[:-1]
+    curr_o, curr_c = o[1:], c[1:]
     
-    engulfing = (
-        prev_bullish &
-        curr_bearish &
-        (df['open'] >= df['close'].shift(1)) &
-        (df['close'] <= df['open'].shift(1))
-    ).astype(int)
+    engulfing = np.zeros(len(c), dtype=np.uint8)
+    engulfing[1:] = (
+        (prev_c > prev_o) &
+        (curr_c < curr_o) &
+        (curr_o >= prev_c) &
+        (curr_c <= prev_o)
+    )
     
     return engulfing
 
-def detect_hammer(df: pd.DataFrame, body_ratio: float = 0.3, wick_ratio: float = 2.0) -> pd.Series:
+def detect_hammer(s: SharedArrays, body_ratio: float = 0.3, wick_ratio: float = 2.0) -> np.ndarray:
     """
     Hammer: Small body at top, long lower wick
     Bullish reversal pattern (rejection of lower prices)
@@ -88,38 +151,40 @@ def detect_hammer(df: pd.DataFrame, body_ratio: float = 0.3, wick_ratio: float =
     wick_ratio : float
         Minimum ratio of lower wick to body
     """
-    body = abs(df['close'] - df['open'])
-    total_range = df['high'] - df['low']
-    lower_wick = df[['open', 'close']].min(axis=1) - df['low']
-    upper_wick = df['high'] - df[['open', 'close']].max(axis=1)
+    body = s.body
+    total_range = s.range
+    lower_wick = s.lower_wick
+    upper_wick = s.upper_wick
     
     hammer = (
-        (body / total_range <= body_ratio) &
-        (lower_wick / (body + 1e-10) >= wick_ratio) &
+        (total_range > 0) &
+        (body <= body_ratio * total_range) &
+        (lower_wick >= wick_ratio * (body + 1e-10)) &
         (upper_wick < body)
-    ).astype(int)
+    )
     
-    return hammer
+    return hammer.astype(np.uint8)
 
-def detect_shooting_star(df: pd.DataFrame, body_ratio: float = 0.3, wick_ratio: float = 2.0) -> pd.Series:
+def detect_shooting_star(s: SharedArrays, body_ratio: float = 0.3, wick_ratio: float = 2.0) -> np.ndarray:
     """
     Shooting Star: Small body at bottom, long upper wick
     Bearish reversal pattern (rejection of higher prices)
     """
-    body = abs(df['close'] - df['open'])
-    total_range = df['high'] - df['low']
-    lower_wick = df[['open', 'close']].min(axis=1) - df['low']
-    upper_wick = df['high'] - df[['open', 'close']].max(axis=1)
+    body = s.body
+    total_range = s.range
+    lower_wick = s.lower_wick
+    upper_wick = s.upper_wick
     
     shooting_star = (
-        (body / total_range <= body_ratio) &
-        (upper_wick / (body + 1e-10) >= wick_ratio) &
+        (total_range > 0) &
+        (body <= body_ratio * total_range) &
+        (upper_wick >= wick_ratio * (body + 1e-10)) &
         (lower_wick < body)
-    ).astype(int)
+    )
     
-    return shooting_star
+    return shooting_star.astype(np.uint8)
 
-def detect_doji(df: pd.DataFrame, body_threshold: float = 0.1) -> pd.Series:
+def detect_doji(s: SharedArrays, body_threshold: float = 0.1) -> np.ndarray:
     """
     Doji: Open and close nearly equal
     Indicates indecision, potential reversal
@@ -129,14 +194,16 @@ def detect_doji(df: pd.DataFrame, body_threshold: float = 0.1) -> pd.Series:
     body_threshold : float
         Maximum body size as fraction of total range
     """
-    body = abs(df['close'] - df['open'])
-    total_range = df['high'] - df['low']
+    body = s.body
+    total_range = s.range
     
-    doji = (body / (total_range + 1e-10) <= body_threshold).astype(int)
+    # A flat bar (zero range, zero body) counts as a doji; the 1e-10 margin
+    # settles exact ties on tick-rounded prices as before
+    doji = body <= body_threshold * (total_range + 1e-10)
     
-    return doji
+    return doji.astype(np.uint8)
 
-def detect_pin_bar(df: pd.DataFrame, wick_ratio: float = 0.66) -> pd.Series:
+def detect_pin_bar(s: SharedArrays, wick_ratio: float = 0.66) -> np.ndarray:
     """
     Pin Bar: Long wick on one side (either direction)
     Indicates rejection of price level
@@ -146,160 +213,164 @@ def detect_pin_bar(df: pd.DataFrame, wick_ratio: float = 0.66) -> pd.Series:
     wick_ratio : float
         Minimum wick length as fraction of total range
     """
-    total_range = df['high'] - df['low']
-    lower_wick = df[['open', 'close']].min(axis=1) - df['low']
-    upper_wick = df['high'] - df[['open', 'close']].max(axis=1)
+    total_range = s.range
+    lower_wick = s.lower_wick
+    upper_wick = s.upper_wick
     
     pin_bar = (
-        ((lower_wick / (total_range + 1e-10)) >= wick_ratio) |
-        ((upper_wick / (total_range + 1e-10)) >= wick_ratio)
-    ).astype(int)
+        (lower_wick >= wick_ratio * (total_range + 1e-10)) |
+        (upper_wick >= wick_ratio * (total_range + 1e-10))
+    )
     
-    return pin_bar
+    return pin_bar.astype(np.uint8)
 
-def detect_bullish_pin_bar(df: pd.DataFrame, wick_ratio: float = 0.66) -> pd.Series:
+def detect_bullish_pin_bar(s: SharedArrays, wick_ratio: float = 0.66) -> np.ndarray:
     """Bullish Pin Bar: Long lower wick (rejection of lower prices)"""
-    total_range = df['high'] - df['low']
-    lower_wick = df[['open', 'close']].min(axis=1) - df['low']
+    total_range = s.range
+    lower_wick = s.lower_wick
     
-    bullish_pin = ((lower_wick / (total_range + 1e-10)) >= wick_ratio).astype(int)
+    bullish_pin = lower_wick >= wick_ratio * (total_range + 1e-10)
     
-    return bullish_pin
+    return bullish_pin.astype(np.uint8)
 
-def detect_bearish_pin_bar(df: pd.DataFrame, wick_ratio: float = 0.66) -> pd.Series:
+def detect_bearish_pin_bar(s: SharedArrays, wick_ratio: float = 0.66) -> np.ndarray:
     """Bearish Pin Bar: Long upper wick (rejection of higher prices)"""
-    total_range = df['high'] - df['low']
-    upper_wick = df['high'] - df[['open', 'close']].max(axis=1)
+    total_range = s.range
+    upper_wick = s.upper_wick
     
-    bearish_pin = ((upper_wick / (total_range + 1e-10)) >= wick_ratio).astype(int)
+    bearish_pin = upper_wick >= wick_ratio * (total_range + 1e-10)
     
-    return bearish_pin
+    return bearish_pin.astype(np.uint8)
 
-def detect_marubozu_bullish(df: pd.DataFrame, wick_threshold: float = 0.05) -> pd.Series:
+def detect_marubozu_bullish(s: SharedArrays, wick_threshold: float = 0.05) -> np.ndarray:
     """
     Bullish Marubozu: Large bullish candle with little to no wicks
     Strong bullish continuation
     """
-    body = df['close'] - df['open']
-    total_range = df['high'] - df['low']
+    # Signed move, positive on bullish bars (no abs needed)
+    body = s.move
+    total_range = s.range
     
     marubozu = (
         (body > 0) &
-        (body / (total_range + 1e-10) >= (1 - wick_threshold))
-    ).astype(int)
+        (body >= (1 - wick_threshold) * (total_range + 1e-10))
+    )
     
-    return marubozu
+    return marubozu.astype(np.uint8)
 
-def detect_marubozu_bearish(df: pd.DataFrame, wick_threshold: float = 0.05) -> pd.Series:
+def detect_marubozu_bearish(s: SharedArrays, wick_threshold: float = 0.05) -> np.ndarray:
     """
     Bearish Marubozu: Large bearish candle with little to no wicks
     Strong bearish continuation
     """
-    body = df['open'] - df['close']
-    total_range = df['high'] - df['low']
+    # Negated signed move, positive on bearish bars (no abs needed)
+    body = -s.move
+    total_range = s.range
     
     marubozu = (
         (body > 0) &
-        (body / (total_range + 1e-10) >= (1 - wick_threshold))
-    ).astype(int)
+        (body >= (1 - wick_threshold) * (total_range + 1e-10))
+    )
     
-    return marubozu
+    return marubozu.astype(np.uint8)
 
-def detect_morning_star(df: pd.DataFrame) -> pd.Series:
+def detect_morning_star(s: SharedArrays) -> np.ndarray:
     """
     Morning Star: 3-bar bullish reversal pattern
     1. Large bearish candle
     2. Small-bodied candle (gap down)
     3. Large bullish candle
     """
+    o, c = s.o, s.c
+    morning_star = np.zeros(len(c), dtype=np.uint8)
+    
+    # Bar 3: Bullish (cheapest test first; the rest only on these bars)
+    idx = np.flatnonzero(c[2:] > o[2:]) + 2
+    
     # Bar 1: Bearish
-    bar1_bearish = df['close'].shift(2) < df['open'].shift(2)
-    bar1_body = abs(df['close'].shift(2) - df['open'].shift(2))
+    bar1_bearish = c[idx - 2] < o[idx - 2]
+    bar1_body = s.body[idx - 2]
     
     # Bar 2: Small body
-    bar2_body = abs(df['close'].shift(1) - df['open'].shift(1))
-    bar2_small = bar2_body < bar1_body * 0.3
-    
-    # Bar 3: Bullish
-    bar3_bullish = df['close'] > df['open']
-    bar3_body = abs(df['close'] - df['open'])
+    bar2_small = s.body[idx - 1] < bar1_body * 0.3
     
     # Pattern
-    morning_star = (
+    morning_star[idx] = (
         bar1_bearish &
         bar2_small &
-        bar3_bullish &
-        (bar3_body > bar1_body * 0.5)
-    ).astype(int)
+        (s.body[idx] > bar1_body * 0.5)
+    )
     
     return morning_star
 
-def detect_evening_star(df: pd.DataFrame) -> pd.Series:
+def detect_evening_star(s: SharedArrays) -> np.ndarray:
     """
     Evening Star: 3-bar bearish reversal pattern
     1. Large bullish candle
     2. Small-bodied candle (gap up)
     3. Large bearish candle
     """
+    o, c = s.o, s.c
+    evening_star = np.zeros(len(c), dtype=np.uint8)
+    
+    # Bar 3: Bearish (cheapest test first; the rest only on these bars)
+    idx = np.flatnonzero(c[2:] < o[2:]) + 2
+    
     # Bar 1: Bullish
-    bar1_bullish = df['close'].shift(2) > df['open'].shift(2)
-    bar1_body = abs(df['close'].shift(2) - df['open'].shift(2))
+    bar1_bullish = c[idx - 2] > o[idx - 2]
+    bar1_body = s.body[idx - 2]
     
     # Bar 2: Small body
-    bar2_body = abs(df['close'].shift(1) - df['open'].shift(1))
-    bar2_small = bar2_body < bar1_body * 0.3
-    
-    # Bar 3: Bearish
-    bar3_bearish = df['close'] < df['open']
-    bar3_body = abs(df['close'] - df['open'])
+    bar2_small = s.body[idx - 1] < bar1_body * 0.3
     
     # Pattern
-    evening_star = (
+    evening_star[idx] = (
         bar1_bullish &
         bar2_small &
-        bar3_bearish &
-        (bar3_body > bar1_body * 0.5)
-    ).astype(int)
+        (s.body[idx] > bar1_body * 0.5)
+    )
     
     return evening_star
 
-def detect_three_white_soldiers(df: pd.DataFrame) -> pd.Series:
+def detect_three_white_soldiers(s: SharedArrays) -> np.ndarray:
     """
     Three White Soldiers: 3 consecutive bullish candles with higher closes
     Strong bullish continuation
     """
-    bullish_1 = df['close'].shift(2) > df['open'].shift(2)
-    bullish_2 = df['close'].shift(1) > df['open'].shift(1)
-    bullish_3 = df['close'] > df['open']
+    o, c = s.o, s.c
+    pattern = np.zeros(len(c), dtype=np.uint8)
     
-    higher_closes = (
-        (df['close'] > df['close'].shift(1)) &
-        (df['close'].shift(1) > df['close'].shift(2))
-    )
+    # Bullish bar with a higher close first; earlier bars only on these
+    idx = np.flatnonzero((c[2:] > o[2:]) & (c[2:] > c[1:-1])) + 2
     
-    pattern = (bullish_1 & bullish_2 & bullish_3 & higher_closes).astype(int)
+    pattern[idx] = (
+        (c[idx - 1] > o[idx - 1]) &
+        (c[idx - 1] > c[idx - 2]) &
+        (c[idx - 2] > o[idx - 2])
+    )
     
     return pattern
 
-def detect_three_black_crows(df: pd.DataFrame) -> pd.Series:
+def detect_three_black_crows(s: SharedArrays) -> np.ndarray:
     """
     Three Black Crows: 3 consecutive bearish candles with lower closes
     Strong bearish continuation
     """
-    bearish_1 = df['close'].shift(2) < df['open'].shift(2)
-    bearish_2 = df['close'].shift(1) < df['open'].shift(1)
-    bearish_3 = df['close'] < df['open']
+    o, c = s.o, s.c
+    pattern = np.zeros(len(c), dtype=np.uint8)
     
-    lower_closes = (
-        (df['close'] < df['close'].shift(1)) &
-        (df['close'].shift(1) < df['close'].shift(2))
-    )
+    # Bearish bar with a lower close first; earlier bars only on these
+    idx = np.flatnonzero((c[2:] < o[2:]) & (c[2:] < c[1:-1])) + 2
     
-    pattern = (bearish_1 & bearish_2 & bearish_3 & lower_closes).astype(int)
+    pattern[idx] = (
+        (c[idx - 1] < o[idx - 1]) &
+        (c[idx - 1] < c[idx - 2]) &
+        (c[idx - 2] < o[idx - 2])
+    )
     
     return pattern
 
-def detect_tweezer_bottom(df: pd.DataFrame, tolerance: float = 0.001) -> pd.Series:
+def detect_tweezer_bottom(s: SharedArrays, tolerance: float = 0.001) -> np.ndarray:
     """
     Tweezer Bottom: Two candles with similar lows
     Bullish reversal pattern
@@ -309,74 +380,90 @@ def detect_tweezer_bottom(df: pd.DataFrame, tolerance: float = 0.001) -> pd.Seri
     tolerance : float
         Maximum price difference as fraction of price
     """
-    low_diff = abs(df['low'] - df['low'].shift(1))
-    similar_lows = (low_diff / df['low'] <= tolerance)
+    o, l, c = s.o, s.l, s.c
+    low_diff = np.abs(l[1:] - l[:-1])
+    # diff / low <= tolerance, cross-multiplied (valid for positive prices)
+    similar_lows = (l[1:] > 0) & (low_diff <= l[1:] * tolerance)
     
     # First candle bearish, second bullish
     reversal = (
-        (df['close'].shift(1) < df['open'].shift(1)) &
-        (df['close'] > df['open'])
+        (c[:-1] < o[:-1]) &
+        (c[1:] > o[1:])
     )
     
-    pattern = (similar_lows & reversal).astype(int)
+    pattern = np.zeros(len(c), dtype=np.uint8)
+    pattern[1:] = similar_lows & reversal
     
     return pattern
 
-def detect_tweezer_top(df: pd.DataFrame, tolerance: float = 0.001) -> pd.Series:
+def detect_tweezer_top(s: SharedArrays, tolerance: float = 0.001) -> np.ndarray:
     """
     Tweezer Top: Two candles with similar highs
     Bearish reversal pattern
     """
-    high_diff = abs(df['high'] - df['high'].shift(1))
-    similar_highs = (high_diff / df['high'] <= tolerance)
+    o, h, c = s.o, s.h, s.c
+    high_diff = np.abs(h[1:] - h[:-1])
+    # diff / high <= tolerance, cross-multiplied (valid for positive prices)
+    similar_highs = (h[1:] > 0) & (high_diff <= h[1:] * tolerance)
     
     # First candle bullish, second bearish
     reversal = (
-        (df['close'].shift(1) > df['open'].shift(1)) &
-        (df['close'] < df['open'])
+        (c[:-1] > o[:-1]) &
+        (c[1:] < o[1:])
     )
     
-    pattern = (similar_highs & reversal).astype(int)
+    pattern = np.zeros(len(c), dtype=np.uint8)
+    pattern[1:] = similar_highs & reversal
     
     return pattern
 
-def detect_harami_bullish(df: pd.DataFrame) -> pd.Series:
+def detect_harami_bullish(s: SharedArrays) -> np.ndarray:
     """
     Bullish Harami: Small bullish candle within previous large bearish candle
     Potential bullish reversal
     """
-    prev_bearish = df['close'].shift(1) < df['open'].shift(1)
-    prev_large = abs(df['close'].shift(1) - df['open'].shift(1)) > abs(df['close'] - df['open']) * 2
+    o, c = s.o, s.c
+    prev_o, prev_c = o[:-1], c[:-1]
+    curr_o, curr_c = o[1:], c[1:]
+    
+    prev_bearish = prev_c < prev_o
+    prev_large = s.body[:-1] > s.body[1:] * 2
     
-    curr_bullish = df['close'] > df['open']
+    curr_bullish = curr_c > curr_o
     curr_within = (
-        (df['open'] >= df['close'].shift(1)) &
-        (df['close'] <= df['open'].shift(1))
+        (curr_o >= prev_c) &
+        (curr_c <= prev_o)
     )
     
-    pattern = (prev_bearish & prev_large & curr_bullish & curr_within).astype(int)
+    pattern = np.zeros(len(c), dtype=np.uint8)
+    pattern[1:] = prev_bearish & prev_large & curr_bullish & curr_within
     
     return pattern
 
-def detect_harami_bearish(df: pd.DataFrame) -> pd.Series:
+def detect_harami_bearish(s: SharedArrays) -> np.ndarray:
     """
     Bearish Harami: Small bearish candle within previous large bullish candle
     Potential bearish reversal
     """
-    prev_bullish = df['close'].shift(1) > df['open'].shift(1)
-    prev_large = abs(df['close'].shift(1) - df['open'].shift(1)) > abs(df['close'] - df['open']) * 2
+    o, c = s.o, s.c
+    prev_o, prev_c = o[:-1], c[:-1]
+    curr_o, curr_c = o[1:], c[1:]
     
-    curr_bearish = df['close'] < df['open']
+    prev_bullish = prev_c > prev_o
+    prev_large = s.body[:-1] > s.body[1:] * 2
+    
+    curr_bearish = curr_c < curr_o
     curr_within = (
-        (df['open'] <= df['close'].shift(1)) &
-        (df['close'] >= df['open'].shift(1))
+        (curr_o <= prev_c) &
+        (curr_c >= prev_o)
     )
     
-    pattern = (prev_bullish & prev_large & curr_bearish & curr_within).astype(int)
+    pattern = np.zeros(len(c), dtype=np.uint8)
+    pattern[1:] = prev_bullish & prev_large & curr_bearish & curr_within
     
     return pattern
 
-def detect_breakout_bar(df: pd.DataFrame, lookback: int = 20) -> pd.Series:
+def detect_breakout_bar(s: SharedArrays, lookback: int = 20) -> np.ndarray:
     """
     Breakout Bar: Current close breaks above recent high
     Strong bullish momentum
@@ -386,24 +473,30 @@ def detect_breakout_bar(df: pd.DataFrame, lookback: int = 20) -> pd.Series:
     lookback : int
         Number of bars to look back for high/low
     """
-    recent_high = df['high'].shift(1).rolling(window=lookback).max()
+    h, c = s.h, s.c
+    # Highest high of the previous `lookback` bars
+    recent_high = _rolling_extreme(h, lookback, True)
     
-    breakout = (df['close'] > recent_high).astype(int)
+    breakout = np.zeros(len(c), dtype=np.uint8)
+    breakout[1:] = c[1:] > recent_high[:-1]
     
     return breakout
 
-def detect_breakdown_bar(df: pd.DataFrame, lookback: int = 20) -> pd.Series:
+def detect_breakdown_bar(s: SharedArrays, lookback: int = 20) -> np.ndarray:
     """
     Breakdown Bar: Current close breaks below recent low
     Strong bearish momentum
     """
-    recent_low = df['low'].shift(1).rolling(window=lookback).min()
+    l, c = s.l, s.c
+    # Lowest low of the previous `lookback` bars
+    recent_low = _rolling_extreme(l, lookback, False)
     
-    breakdown = (df['close'] < recent_low).astype(int)
+    breakdown = np.zeros(len(c), dtype=np.uint8)
+    breakdown[1:] = c[1:] < recent_low[:-1]
     
     return breakdown
 
-def detect_range_expansion(df: pd.DataFrame, period: int = 20, threshold: float = 1.5) -> pd.Series:
+def detect_range_expansion(s: SharedArrays, period: int = 20, threshold: float = 1.5) -> np.ndarray:
     """
     Range Expansion: Current bar range significantly larger than average
     Indicates volatility increase
@@ -415,13 +508,53 @@ def detect_range_expansion(df: pd.DataFrame, period: int = 20, threshold: float
     threshold : float
         Multiplier of average range to trigger signal
     """
-    bar_range = df['high'] - df['low']
-    avg_range = bar_range.rolling(window=period).mean()
+    c = s.c
+    bar_range = s.range
     
-    expansion = (bar_range > avg_range.shift(1) * threshold).astype(int)
+    expansion = np.zeros(len(c), dtype=np.uint8)
+    if len(c) > period:
+        # Average range of the previous `period` bars
+        avg_range = pd.Series(bar_range[:-1]).rolling(window=period).mean().to_numpy()[period - 1:]
+        expansion[period:] = bar_range[period:] > avg_range * threshold
     
     return expansion
 
+def _pattern_matrix(df: pd.DataFrame) -> np.ndarray:
+    """
+    Run the fused kernel and return a uint8 array of shape (len(PATTERN_NAMES), n)
+    
+    Patterns depend only on OHLC, so results are memoized on a hash of the
+    full OHLC arrays; repeat calls on the same data skip detection. The
+    returned array is shared with the cache and marked read-only.
+    """
+    s = shared_arrays(df)
+    
+    digest = hashlib.blake2b(digest_size=16)
+    for a in (s.o, s.h, s.l, s.c):
+        digest.update(a.tobytes())
+    key = digest.digest()
+    
+    out = _pattern_cache.get(key)
+    if out is not None:
+        _pattern_cache.move_to_end(key)
+        return out
+    
+    # Rolling extremes for the breakout patterns, then all patterns in a single
+    # pass over the bars (same rules as the detectors above)
+    out = np.empty((len(PATTERN_NAMES), len(s.c)), dtype=np.uint8)
+    _detect_all(
+        s.o, s.h, s.l, s.c,
+        _rolling_extreme(s.h, 20, True), _rolling_extreme(s.l, 20, False),
+        _rolling_extreme(s.h, 10, True), _rolling_extreme(s.l, 10, False),
+        out
+    )
+    out.flags.writeable = False
+    
+    _pattern_cache[key] = out
+    if len(_pattern_cache) > PATTERN_CACHE_SIZE:
+        _pattern_cache.popitem(last=False)
+    return out
+
 def detect_all_patterns(df: pd.DataFrame) -> pd.DataFrame:
     """
     Detect all candlestick patterns and add to dataframe
@@ -430,49 +563,75 @@ def detect_all_patterns(df: pd.DataFrame) -> pd.DataFrame:
     -----------
     df : pd.DataFrame
         OHLC dataframe
-        
+    
     Returns:
     --------
-    pd.DataFrame with all pattern columns added
-    """
-    df = df.copy()
-    
-    # Single-bar patterns
-    df['pattern_inside_bar'] = detect_inside_bar(df)
-    df['pattern_outside_bar'] = detect_outside_bar(df)
-    df['pattern_doji'] = detect_doji(df)
-    df['pattern_hammer'] = detect_hammer(df)
-    df['pattern_shooting_star'] = detect_shooting_star(df)
-    df['pattern_pin_bar'] = detect_pin_bar(df)
-    df['pattern_bullish_pin'] = detect_bullish_pin_bar(df)
-    df['pattern_bearish_pin'] = detect_bearish_pin_bar(df)
-    df['pattern_marubozu_bull'] = detect_marubozu_bullish(df)
-    df['pattern_marubozu_bear'] = detect_marubozu_bearish(df)
-    
-    # Two-bar patterns
-    df['pattern_bullish_engulfing'] = detect_bullish_engulfing(df)
-    df['pattern_bearish_engulfing'] = detect_bearish_engulfing(df)
-    df['pattern_tweezer_bottom'] = detect_tweezer_bottom(df)
-    df['pattern_tweezer_top'] = detect_tweezer_top(df)
-    df['pattern_harami_bull'] = detect_harami_bullish(df)
-    df['pattern_harami_bear'] = detect_harami_bearish(df)
-    
-    # Three-bar patterns
-    df['pattern_morning_star'] = detect_morning_star(df)
-    df['pattern_evening_star'] = detect_evening_star(df)
-    df['pattern_three_white_soldiers'] = detect_three_white_soldiers(df)
-    df['pattern_three_black_crows'] = detect_three_black_crows(df)
-    
-    # Breakout patterns
-    df['pattern_breakout_20'] = detect_breakout_bar(df, 20)
-    df['pattern_breakdown_20'] = detect_breakdown_bar(df, 20)
-    df['pattern_breakout_10'] = detect_breakout_bar(df, 10)
-    df['pattern_breakdown_10'] = detect_breakdown_bar(df, 10)
-    
-    # Range patterns
-    df['pattern_range_expansion'] = detect_range_expansion(df, 20, 1.5)
-    
-    return df
+    New pd.DataFrame with all pattern columns added (uint8). The input df is
+    not modified, so callers must use the returned frame.
+    """
+    out = _pattern_matrix(df)
+    
+    # Replace pattern columns from an earlier run; only drop (a new frame)
+    # when there are any, otherwise concat straight from df
+    existing = [col for col in PATTERN_NAMES if col in df.columns]
+    base = df.drop(columns=existing) if existing else df
+    
+    # Add all pattern columns as one block; out.T wraps the kernel output without a copy
+    patterns_df = pd.DataFrame(out.T, index=df.index, columns=list(PATTERN_NAMES))
+    return pd.concat([base, patterns_df], axis=1)
+
+def detect_all_patterns_packed(df: pd.DataFrame) -> pd.Series:
+    """
+    Detect all candlestick patterns as a single bit-packed column
+    
+    Bit PATTERN_BITS[name] of each value is set when that pattern occurs on the
+    bar, so one uint32 per bar replaces the 25 uint8 pattern columns.
+    StrategyBuilder.add_pattern reads patterns from this column when the
+    individual pattern column is absent.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        OHLC dataframe
+    
+    Returns:
+    --------
+    pd.Series (uint32) named PACKED_PATTERN_COLUMN, aligned to df.index
+    """
+    out = _pattern_matrix(df)
+    
+    packed = np.zeros(out.shape[1], dtype=np.uint32)
+    for bit in range(out.shape[0]):
+        packed |= out[bit].astype(np.uint32) << np.uint32(bit)
+    
+    return pd.Series(packed, index=df.index, name=PACKED_PATTERN_COLUMN)
+
+def detect_latest_patterns(df: pd.DataFrame, n_bars: int = 1) -> pd.DataFrame:
+    """
+    Detect all candlestick patterns for the last n_bars bars only
+    
+    For live updates: only the new bars and the MAX_LOOKBACK bars before them
+    are read, so the cost does not grow with the history length. Values match
+    the corresponding rows of detect_all_patterns(df).
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        OHLC dataframe, oldest bar first
+    n_bars : int
+        Number of most recent bars to evaluate
+    
+    Returns:
+    --------
+    pd.DataFrame (uint8) with the pattern columns for the last n_bars rows
+    """
+    n_bars = min(n_bars, len(df))
+    s = shared_arrays(df.iloc[-(n_bars + MAX_LOOKBACK):])
+    
+    out = np.empty((len(PATTERN_NAMES), n_bars), dtype=np.uint8)
+    _detect_tail(s.o, s.h, s.l, s.c, len(s.c) - n_bars, out)
+    
+    return pd.DataFrame(out.T, index=df.index[len(df) - n_bars:], columns=list(PATTERN_NAMES))
 
 def get_pattern_summary(df: pd.DataFrame) -> Dict[str, int]:
     """
@@ -484,13 +643,7 @@ def get_pattern_summary(df: pd.DataFrame) -> Dict[str, int]:
     """
     pattern_cols = [col for col in df.columns if col.startswith('pattern_')]
     
-    summary = {}
-    for col in pattern_cols:
-        pattern_name = col.replace('pattern_', '')
-        count = df[col].sum()
-        summary[pattern_name] = int(count)
+    # One reduction over the pattern block (NaN-skipping, like Series.sum)
+    counts = df[pattern_cols].sum(axis=0)
     
-    return summary
-
-
-
+    return {col.replace('pattern_', ''): int(count) for col, count in counts.items()}
@@ -17,11 +17,16 @@ python signal_generator_gold_1d.py --validate
 
 import sys
 import argparse
+import hashlib
 from datetime import datetime
 from pathlib import Path
+from typing import Dict, List, Optional
+import numpy as np
 import pandas as pd
 
 from utils import load_features, get_logger
+from _backtest_loops import _and_row_groups, _trade_levels
+import strategy_builder
 from strategy_builder import StrategyBuilder
 
 logger = get_logger(__name__)
@@ -30,69 +35,203 @@ logger = get_logger(__name__)
 # STRATEGY DEFINITIONS (From Optimization Results)
 # =============================================================================
 
-def strategy_1_range_expansion(df: pd.DataFrame) -> pd.Series:
+# Indicator filters used by the strategies: name -> (category, expression).
+# Several strategies share a filter, so each is evaluated once per dataframe
+# by precompute_common_filters and the strategies AND the resulting masks.
+COMMON_FILTERS = {
+    'above_ema20': ('Trend', 'price_above_ema20 == 1'),
+    'rsi_ge_40': ('Momentum', 'rsi_14 >= 40'),
+    'rsi_ge_45': ('Momentum', 'rsi_14 >= 45'),
+    'adx_ge_18': ('Strength', 'adx_14 >= 18'),
+    'adx_ge_28': ('Strength', 'adx_14 >= 28'),
+    'atr_ge_0_5': ('Volatility', 'atr_pct_14 >= 0.5'),
+    'atr_ge_0_8': ('Volatility', 'atr_pct_14 >= 0.8'),
+    'atr_ge_0_9': ('Volatility', 'atr_pct_14 >= 0.9'),
+    'atr_le_1_8': ('Volatility', 'atr_pct_14 <= 1.8'),
+    'atr_le_2_5': ('Volatility', 'atr_pct_14 <= 2.5'),
+    'dist_le_1_0': ('Proximity', 'dist_ema20 <= 1.0'),
+    'dist_le_1_2': ('Proximity', 'dist_ema20 <= 1.2'),
+    'dist_le_2_0': ('Proximity', 'dist_ema20 <= 2.0'),
+    'vol_ge_0_8': ('Volume', 'volume_ratio >= 0.8'),
+    'vol_ge_1_0': ('Volume', 'volume_ratio >= 1.0'),
+}
+
+def precompute_common_filters(df: pd.DataFrame) -> Dict[str, np.ndarray]:
     """
-    STRATEGY #1: Range Expansion (PRIMARY)
+    Evaluate every filter in COMMON_FILTERS once
     
-    Performance: 40 trades, 70% WR, 2.86 PF, 13.69% DD
+    Returns:
+    --------
+    Dict of filter name -> boolean mask aligned with df rows
     """
-    strategy = StrategyBuilder(df)
-    
-    # Pattern
-    strategy.add_pattern('pattern_range_expansion')
+    return {
+        name: df.eval(expression).to_numpy(dtype=bool)
+        for name, (_, expression) in COMMON_FILTERS.items()
+    }
+
+def _build_strategy(df: pd.DataFrame, pattern: str, filter_names: List[str],
+                    filters: Optional[Dict[str, np.ndarray]]) -> pd.Series:
+    """Pattern plus precomputed filter masks (computed here if not given)"""
+    if filters is None:
+        filters = precompute_common_filters(df)
     
-    # Filters
-    strategy.add_momentum_filter('rsi_14 >= 45')
-    strategy.add_strength_filter('adx_14 >= 18')
-    strategy.add_volatility_filter('atr_pct_14 >= 0.8')
-    strategy.add_volatility_filter('atr_pct_14 <= 1.8')
-    strategy.add_proximity_filter('dist_ema20 <= 1.0')
-    strategy.add_volume_filter('volume_ratio >= 1.0')
+    strategy = StrategyBuilder(df)
+    strategy.add_pattern(pattern)
+    for name in filter_names:
+        category, expression = COMMON_FILTERS[name]
+        strategy.add_mask(filters[name], f"{category}: {expression}")
     
     return strategy.get_entry_signal()
 
-def strategy_2_inside_bar(df: pd.DataFrame) -> pd.Series:
+# Strategy rules: signal column -> (pattern, COMMON_FILTERS names)
+STRATEGY_RULES = {
+    'signal_range_expansion': ('pattern_range_expansion', [
+        'rsi_ge_45',
+        'adx_ge_18',
+        'atr_ge_0_8',
+        'atr_le_1_8',
+        'dist_le_1_0',
+        'vol_ge_1_0',
+    ]),
+    'signal_inside_bar': ('pattern_inside_bar', [
+        'rsi_ge_45',
+        'adx_ge_28',    # Higher ADX
+        'atr_ge_0_9',
+        'atr_le_1_8',
+        'dist_le_2_0',  # More flexible
+        'vol_ge_0_8',
+    ]),
+    'signal_breakout_10': ('pattern_breakout_10', [
+        'above_ema20',  # Trend required
+        'rsi_ge_40',
+        'adx_ge_18',
+        'atr_ge_0_5',
+        'atr_le_2_5',
+        'dist_le_1_2',
+        'vol_ge_1_0',
+    ]),
+}
+
+def strategy_1_range_expansion(df: pd.DataFrame, filters: Optional[Dict[str, np.ndarray]] = None) -> pd.Series:
+    """
+    STRATEGY #1: Range Expansion (PRIMARY)
+    
+    Performance: 40 trades, 70% WR, 2.86 PF, 13.69% DD
+    """
+    return _build_strategy(df, *STRATEGY_RULES['signal_range_expansion'], filters)
+
+def strategy_2_inside_bar(df: pd.DataFrame, filters: Optional[Dict[str, np.ndarray]] = None) -> pd.Series:
     """
     STRATEGY #2: Inside Bar (ALTERNATIVE)
     
     Performance: 37 trades, 56.8% WR, 1.91 PF, 14.06% DD
     """
-    strategy = StrategyBuilder(df)
+    return _build_strategy(df, *STRATEGY_RULES['signal_inside_bar'], filters)
+
+def strategy_3_breakout_10(df: pd.DataFrame, filters: Optional[Dict[str, np.ndarray]] = None) -> pd.Series:
+    """
+    STRATEGY #3: Breakout 10 (CONSERVATIVE)
     
-    # Pattern
-    strategy.add_pattern('pattern_inside_bar')
+    Performance: 29 trades, 62.1% WR, 2.21 PF, 13.80% DD
+    """
+    return _build_strategy(df, *STRATEGY_RULES['signal_breakout_10'], filters)
+
+# Signal column -> strategy, as stored by load_signals
+SIGNAL_COLUMNS = {
+    'signal_range_expansion': strategy_1_range_expansion,
+    'signal_inside_bar': strategy_2_inside_bar,
+    'signal_breakout_10': strategy_3_breakout_10,
+}
+
+SIGNAL_CACHE_DIR = Path('models') / 'cache'
+TRADE_LOG_PATH = Path('models') / 'gold_1d_long_trade_log.csv'
+
+def compute_signals(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Evaluate all SIGNAL_COLUMNS strategies together
     
-    # Filters
-    strategy.add_momentum_filter('rsi_14 >= 45')
-    strategy.add_strength_filter('adx_14 >= 28')  # Higher ADX
-    strategy.add_volatility_filter('atr_pct_14 >= 0.9')
-    strategy.add_volatility_filter('atr_pct_14 <= 1.8')
-    strategy.add_proximity_filter('dist_ema20 <= 2.0')  # More flexible
-    strategy.add_volume_filter('volume_ratio >= 0.8')
+    Gives the same signals as the strategy_* functions. Each distinct pattern
+    and filter mask is evaluated once and bit-packed into a table, and one
+    compiled pass (_and_row_groups) ANDs it into every strategy's signal.
     
-    return strategy.get_entry_signal()
+    Returns:
+    --------
+    Dict of signal column -> boolean array aligned with df rows
+    """
+    filters = precompute_common_filters(df)
+    patterns = {
+        pattern: StrategyBuilder(df).add_pattern(pattern).get_entry_signal_array()
+        for pattern, _ in STRATEGY_RULES.values()
+    }
+    masks = {**patterns, **filters}
+    names = list(masks)
+    table = np.packbits(np.stack([masks[name] for name in names]), axis=1)
+    
+    rows = [
+        names.index(name)
+        for col in SIGNAL_COLUMNS
+        for name in [STRATEGY_RULES[col][0], *STRATEGY_RULES[col][1]]
+    ]
+    starts = np.cumsum([0] + [1 + len(STRATEGY_RULES[col][1]) for col in SIGNAL_COLUMNS])
+    packed = _and_row_groups(table, np.array(rows, dtype=np.int64), starts.astype(np.int64))
+    signals = np.unpackbits(packed, axis=1, count=len(df)).astype(bool)
+    
+    return dict(zip(SIGNAL_COLUMNS, signals))
 
-def strategy_3_breakout_10(df: pd.DataFrame) -> pd.Series:
+def _build_signals(commodity: str, timeframe: str) -> pd.DataFrame:
+    """Load features and add the SIGNAL_COLUMNS entry signals"""
+    df = load_features(commodity, timeframe)
+    
+    logger.info("\nGenerating signals...")
+    signals = compute_signals(df)
+    
+    df = pd.concat([df, pd.DataFrame(signals, index=df.index)], axis=1)
+    
+    # Index by bar time (keeping the column) so date checks are index lookups
+    df.index = pd.DatetimeIndex(df['time'], name=None)
+    return df
+
+def load_signals(commodity: str = 'gold', timeframe: str = '1d',
+                 data_dir: str = "data/processed") -> pd.DataFrame:
     """
-    STRATEGY #3: Breakout 10 (CONSERVATIVE)
+    Load features with the strategy signal columns, cached on disk
     
-    Performance: 29 trades, 62.1% WR, 2.21 PF, 13.80% DD
+    The signal-annotated frame is pickled under SIGNAL_CACHE_DIR, keyed by the
+    size and modification time of the features file and of the strategy
+    code (this module and strategy_builder). Any change to those rebuilds it.
+    
+    Returns:
+    --------
+    pd.DataFrame with features plus the SIGNAL_COLUMNS, indexed by bar time
     """
-    strategy = StrategyBuilder(df)
+    features_path = Path(data_dir) / f"{commodity.lower()}_{timeframe.lower()}_features.csv"
+    if not features_path.exists():
+        # load_features raises the usual FileNotFoundError
+        return _build_signals(commodity, timeframe)
     
-    # Pattern
-    strategy.add_pattern('pattern_breakout_10')
+    stats = [Path(f).stat() for f in (features_path, __file__, strategy_builder.__file__)]
+    key = hashlib.sha1('|'.join(f"{st.st_mtime_ns}:{st.st_size}" for st in stats).encode()).hexdigest()[:16]
+    cache_path = SIGNAL_CACHE_DIR / f"{commodity.lower()}_{timeframe.lower()}_{key}.pkl"
     
-    # Filters
-    strategy.add_trend_filter('price_above_ema20 == 1')  # Trend required
-    strategy.add_momentum_filter('rsi_14 >= 40')
-    strategy.add_strength_filter('adx_14 >= 18')
-    strategy.add_volatility_filter('atr_pct_14 >= 0.5')
-    strategy.add_volatility_filter('atr_pct_14 <= 2.5')
-    strategy.add_proximity_filter('dist_ema20 <= 1.2')
-    strategy.add_volume_filter('volume_ratio >= 1.0')
+    if cache_path.exists():
+        try:
+            df = pd.read_pickle(cache_path)
+            logger.info(f"Using cached signals from {cache_path}")
+            return df
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable signal cache {cache_path}: {e}")
     
-    return strategy.get_entry_signal()
+    df = _build_signals(commodity, timeframe)
+    
+    try:
+        SIGNAL_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        for stale in SIGNAL_CACHE_DIR.glob(f"{commodity.lower()}_{timeframe.lower()}_*.pkl"):
+            stale.unlink()
+        df.to_pickle(cache_path)
+    except OSError as e:
+        logger.warning(f"Could not write signal cache {cache_path}: {e}")
+    
+    return df
 
 # =============================================================================
 # SIGNAL GENERATOR
@@ -117,7 +256,33 @@ def calculate_trade_levels(row: pd.Series, stop_atr: float = 1.2, tp_atr: float
         'risk_reward': reward / risk if risk > 0 else 0
     }
 
-def check_signals(date: str = None, validate: bool = False):
+def calculate_trade_levels_vec(df: pd.DataFrame, stop_atr: float = 1.2, tp_atr: float = 1.5) -> Dict[str, np.ndarray]:
+    """
+    Calculate entry, stop loss, and take profit levels for every row at once
+    
+    Same formulas as calculate_trade_levels, applied to whole columns in one
+    compiled pass (_trade_levels).
+    
+    Returns:
+    --------
+    Dict of level name -> array aligned with df rows
+    """
+    entry, stop_loss, take_profit, risk, reward, risk_reward = _trade_levels(
+        df['close'].to_numpy(dtype=np.float64),
+        df['atr_14'].to_numpy(dtype=np.float64),
+        stop_atr, tp_atr
+    )
+    
+    return {
+        'entry': entry,
+        'stop_loss': stop_loss,
+        'take_profit': take_profit,
+        'risk': risk,
+        'reward': reward,
+        'risk_reward': risk_reward
+    }
+
+def check_signals(date: str = None, validate: bool = False, validate_limit: Optional[int] = None):
     """
     Check for trading signals
     
@@ -127,26 +292,25 @@ def check_signals(date: str = None, validate: bool = False):
         Specific date to check (format: YYYY-MM-DD)
     validate : bool
         Generate all historical signals for validation
+    validate_limit : int, optional
+        Only validate the signals of the last validate_limit bars, so long
+        histories are not scanned when only recent signals matter; must be at
+        least 1
     """
+    if validate_limit is not None and validate_limit < 1:
+        raise ValueError(f"validate_limit must be at least 1, got {validate_limit}")
+    
     logger.info("="*80)
     logger.info("GOLD 1D LONG - SIGNAL GENERATOR")
     logger.info("="*80)
     
     # Load data
     logger.info("\nLoading Gold 1D data...")
-    df = load_features('gold', '1d')
+    df = load_signals('gold', '1d')
     logger.info(f"Loaded {len(df)} bars from {df['time'].min()} to {df['time'].max()}")
     
-    # Generate signals for all strategies
-    logger.info("\nGenerating signals...")
-    df['signal_range_expansion'] = strategy_1_range_expansion(df)
-    df['signal_inside_bar'] = strategy_2_inside_bar(df)
-    df['signal_breakout_10'] = strategy_3_breakout_10(df)
-    
     # Count total signals
-    total_signals_1 = df['signal_range_expansion'].sum()
-    total_signals_2 = df['signal_inside_bar'].sum()
-    total_signals_3 = df['signal_breakout_10'].sum()
+    total_signals_1, total_signals_2, total_signals_3 = df[list(SIGNAL_COLUMNS)].to_numpy(dtype=bool).sum(axis=0)
     
     logger.info(f"  Strategy #1 (Range Expansion): {total_signals_1} signals")
     logger.info(f"  Strategy #2 (Inside Bar):      {total_signals_2} signals")
@@ -158,33 +322,42 @@ def check_signals(date: str = None, validate: bool = False):
         logger.info("HISTORICAL SIGNALS VALIDATION")
         logger.info("="*80)
         
+        df_validate = df if validate_limit is None else df.tail(validate_limit)
+        if validate_limit is not None:
+            logger.info(f"Last {len(df_validate)} bars, from {df_validate['time'].min()}")
+        
         for strategy_col, strategy_name in [
             ('signal_range_expansion', 'Range Expansion'),
             ('signal_inside_bar', 'Inside Bar'),
             ('signal_breakout_10', 'Breakout 10')
         ]:
-            signals = df[df[strategy_col] == True]
+            # Positions of the signal bars; only the first 10 rows are materialized
+            signal_rows = np.flatnonzero(df_validate[strategy_col].to_numpy(dtype=bool))
             
-            if len(signals) > 0:
-                logger.info(f"\n{strategy_name}: {len(signals)} signals")
+            if len(signal_rows) > 0:
+                logger.info(f"\n{strategy_name}: {len(signal_rows)} signals")
                 logger.info("-" * 80)
                 
-                for idx, row in signals.head(10).iterrows():
-                    levels = calculate_trade_levels(row)
-                    logger.info(f"  {row['time'].strftime('%Y-%m-%d')}: "
-                              f"Entry={levels['entry']:.2f}, "
-                              f"SL={levels['stop_loss']:.2f}, "
-                              f"TP={levels['take_profit']:.2f}")
+                shown = df_validate.iloc[signal_rows[:10]]
+                levels = calculate_trade_levels_vec(shown)
+                dates = shown['time'].dt.strftime('%Y-%m-%d')
                 
-                if len(signals) > 10:
-                    logger.info(f"  ... and {len(signals) - 10} more signals")
+                # One log record for all shown signals
+                logger.info("\n".join(
+                    f"  {day}: Entry={entry:.2f}, SL={stop_loss:.2f}, TP={take_profit:.2f}"
+                    for day, entry, stop_loss, take_profit in zip(
+                        dates, levels['entry'], levels['stop_loss'], levels['take_profit'])
+                ))
+                
+                if len(signal_rows) > 10:
+                    logger.info(f"  ... and {len(signal_rows) - 10} more signals")
         
         return
     
     # Check specific date or latest
     if date:
         check_date = pd.to_datetime(date)
-        df_check = df[df['time'] == check_date]
+        df_check = df.loc[[check_date]] if check_date in df.index else df.iloc[:0]
         
         if len(df_check) == 0:
             logger.error(f"\nDate {date} not found in data")
@@ -201,21 +374,31 @@ def check_signals(date: str = None, validate: bool = False):
     
     row = df_check.iloc[0]
     
+    # Pull the displayed values out of the row in one lookup
+    (open_price, high, low, close, volume, rsi, adx, atr, atr_pct,
+     ema_20, ema_50, volume_ratio) = row[[
+        'open', 'high', 'low', 'close', 'Volume', 'rsi_14', 'adx_14',
+        'atr_14', 'atr_pct_14', 'ema_20', 'ema_50', 'volume_ratio'
+    ]].to_numpy(dtype=float)
+    
     # Display market data
     logger.info(f"\n📊 Market Data:")
-    logger.info(f"   Open:   ₹{row['open']:,.2f}")
-    logger.info(f"   High:   ₹{row['high']:,.2f}")
-    logger.info(f"   Low:    ₹{row['low']:,.2f}")
-    logger.info(f"   Close:  ₹{row['close']:,.2f}")
-    logger.info(f"   Volume: {row['Volume']:,.0f}")
+    logger.info(f"   Open:   ₹{open_price:,.2f}")
+    logger.info(f"   High:   ₹{high:,.2f}")
+    logger.info(f"   Low:    ₹{low:,.2f}")
+    logger.info(f"   Close:  ₹{close:,.2f}")
+    logger.info(f"   Volume: {volume:,.0f}")
     
     logger.info(f"\n📈 Indicators:")
-    logger.info(f"   RSI(14):  {row['rsi_14']:.2f}")
-    logger.info(f"   ADX(14):  {row['adx_14']:.2f}")
-    logger.info(f"   ATR(14):  ₹{row['atr_14']:.2f} ({row['atr_pct_14']:.2f}%)")
-    logger.info(f"   EMA(20):  ₹{row['ema_20']:,.2f}")
-    logger.info(f"   EMA(50):  ₹{row['ema_50']:,.2f}")
-    logger.info(f"   Vol Ratio: {row['volume_ratio']:.2f}x")
+    logger.info(f"   RSI(14):  {rsi:.2f}")
+    logger.info(f"   ADX(14):  {adx:.2f}")
+    logger.info(f"   ATR(14):  ₹{atr:.2f} ({atr_pct:.2f}%)")
+    logger.info(f"   EMA(20):  ₹{ema_20:,.2f}")
+    logger.info(f"   EMA(50):  ₹{ema_50:,.2f}")
+    logger.info(f"   Vol Ratio: {volume_ratio:.2f}x")
+    
+    # Trade levels depend only on the bar, so they are shared by all strategies
+    levels = calculate_trade_levels(row)
     
     # Check each strategy
     signals_found = []
@@ -227,7 +410,6 @@ def check_signals(date: str = None, validate: bool = False):
     # Strategy #1: Range Expansion
     if row['signal_range_expansion']:
         signals_found.append('Range Expansion')
-        levels = calculate_trade_levels(row)
         
         logger.info("\n🚨 STRATEGY #1: RANGE EXPANSION SIGNAL!")
         logger.info("   Status: PRIMARY STRATEGY ⭐")
@@ -246,7 +428,6 @@ def check_signals(date: str = None, validate: bool = False):
     # Strategy #2: Inside Bar
     if row['signal_inside_bar']:
         signals_found.append('Inside Bar')
-        levels = calculate_trade_levels(row)
         
         logger.info("\n🚨 STRATEGY #2: INSIDE BAR SIGNAL!")
         logger.info("   Status: ALTERNATIVE STRATEGY")
@@ -264,7 +445,6 @@ def check_signals(date: str = None, validate: bool = False):
     # Strategy #3: Breakout 10
     if row['signal_breakout_10']:
         signals_found.append('Breakout 10')
-        levels = calculate_trade_levels(row)
         
         logger.info("\n🚨 STRATEGY #3: BREAKOUT 10 SIGNAL!")
         logger.info("   Status: CONSERVATIVE STRATEGY")
@@ -307,64 +487,64 @@ def generate_trade_log():
     logger.info("GENERATING TRADE LOG FOR ALL STRATEGIES")
     logger.info("="*80)
     
-    df = load_features('gold', '1d')
-    
-    # Generate signals
-    df['signal_1'] = strategy_1_range_expansion(df)
-    df['signal_2'] = strategy_2_inside_bar(df)
-    df['signal_3'] = strategy_3_breakout_10(df)
-    
-    # Create trade log
-    trades = []
-    
-    for idx, row in df.iterrows():
-        if row['signal_1'] or row['signal_2'] or row['signal_3']:
-            levels = calculate_trade_levels(row)
-            
-            strategies = []
-            if row['signal_1']:
-                strategies.append('Range_Expansion')
-            if row['signal_2']:
-                strategies.append('Inside_Bar')
-            if row['signal_3']:
-                strategies.append('Breakout_10')
-            
-            trades.append({
-                'date': row['time'],
-                'strategies': '|'.join(strategies),
-                'entry': levels['entry'],
-                'stop_loss': levels['stop_loss'],
-                'take_profit': levels['take_profit'],
-                'risk': levels['risk'],
-                'reward': levels['reward'],
-                'rsi': row['rsi_14'],
-                'adx': row['adx_14'],
-                'atr_pct': row['atr_pct_14']
-            })
-    
-    trades_df = pd.DataFrame(trades)
+    # Load data with signals
+    df = load_signals('gold', '1d')
+    
+    # Create trade log from the signal rows only, all levels at once
+    signal_flags = df[list(SIGNAL_COLUMNS)].to_numpy(dtype=bool)
+    signal_rows = np.flatnonzero(signal_flags.any(axis=1))
+    signal_df = df.iloc[signal_rows]
+    levels = calculate_trade_levels_vec(signal_df)
+    
+    # Strategy labels: encode each row's flags as a 3-bit code and look up the
+    # '|'-joined names for all 8 combinations
+    strategy_names = ('Range_Expansion', 'Inside_Bar', 'Breakout_10')
+    combo_labels = np.array([
+        '|'.join(name for bit, name in enumerate(strategy_names) if code >> bit & 1)
+        for code in range(1 << len(strategy_names))
+    ], dtype=object)
+    codes = signal_flags[signal_rows] @ (1 << np.arange(len(strategy_names)))
+    strategies = combo_labels[codes]
+    
+    # The column arrays are already exactly sized, so wrap them without copying
+    trades_df = pd.DataFrame({
+        'date': signal_df['time'].to_numpy(),
+        'strategies': strategies,
+        'entry': levels['entry'],
+        'stop_loss': levels['stop_loss'],
+        'take_profit': levels['take_profit'],
+        'risk': levels['risk'],
+        'reward': levels['reward'],
+        'rsi': signal_df['rsi_14'].to_numpy(),
+        'adx': signal_df['adx_14'].to_numpy(),
+        'atr_pct': signal_df['atr_pct_14'].to_numpy()
+    }, copy=False)
     
     # Save
-    output_path = Path('models') / 'gold_1d_long_trade_log.csv'
-    trades_df.to_csv(output_path, index=False)
+    TRADE_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+    trades_df.to_csv(TRADE_LOG_PATH, index=False)
     
-    logger.info(f"\n✅ Trade log saved to: {output_path}")
+    logger.info(f"\n✅ Trade log saved to: {TRADE_LOG_PATH}")
     logger.info(f"   Total signal days: {len(trades_df)}")
     logger.info(f"   Date range: {trades_df['date'].min()} to {trades_df['date'].max()}")
     
     # Show stats
     logger.info(f"\n📊 Signal Distribution:")
-    logger.info(f"   Range Expansion:  {df['signal_1'].sum()} signals")
-    logger.info(f"   Inside Bar:       {df['signal_2'].sum()} signals")
-    logger.info(f"   Breakout 10:      {df['signal_3'].sum()} signals")
+    counts = signal_flags.sum(axis=0)
+    logger.info(f"   Range Expansion:  {counts[0]} signals")
+    logger.info(f"   Inside Bar:       {counts[1]} signals")
+    logger.info(f"   Breakout 10:      {counts[2]} signals")
     
     # Show recent signals
     logger.info(f"\n📅 Last 5 Signals:")
     logger.info("-" * 80)
-    for _, trade in trades_df.tail(5).iterrows():
-        logger.info(f"   {trade['date'].strftime('%Y-%m-%d')}: "
-                   f"{trade['strategies']:30s} Entry=₹{trade['entry']:,.0f} "
-                   f"SL=₹{trade['stop_loss']:,.0f} TP=₹{trade['take_profit']:,.0f}")
+    recent = trades_df.tail(5)
+    for day, strategies, entry, stop_loss, take_profit in zip(
+            recent['date'].dt.strftime('%Y-%m-%d'), recent['strategies'],
+            recent['entry'], recent['stop_loss'], recent['take_profit']):
+        logger.info(f"   {day}: "
+                   f"{strategies:30s} Entry=₹{entry:,.0f} "
+                   f"SL=₹{stop_loss:,.0f} TP=₹{take_profit:,.0f}")
     
     logger.info("\n" + "="*80)
 
@@ -372,15 +552,18 @@ def main():
     parser = argparse.ArgumentParser(description="Gold 1D Long Signal Generator")
     parser.add_argument('--date', type=str, help='Specific date to check (YYYY-MM-DD)')
     parser.add_argument('--validate', action='store_true', help='Generate historical signals')
+    parser.add_argument('--validate-limit', type=int, help='Only validate the last N bars')
     parser.add_argument('--trade-log', action='store_true', help='Generate complete trade log')
     
     args = parser.parse_args()
+    if args.validate_limit is not None and args.validate_limit < 1:
+        parser.error('--validate-limit must be at least 1')
     
     try:
         if args.trade_log:
             generate_trade_log()
         elif args.validate:
-            check_signals(validate=True)
+            check_signals(validate=True, validate_limit=args.validate_limit)
         else:
             check_signals(date=args.date)
     
@@ -395,10 +578,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
-
-
-
-
-
-
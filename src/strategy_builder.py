@@ -2,13 +2,86 @@
 Strategy Builder
 Combines patterns and indicators to create trading strategies
 """
+import keyword
+import re
+from functools import lru_cache
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Callable, Optional
+from typing import Dict, List, Callable, Optional, Tuple, Union
 from utils import get_logger
 
 logger = get_logger(__name__)
 
+# 'column op number' and 'column op column' filters, as built by
+# create_pattern_strategy and the rules files' trend filters
+_COMPARISON_FILTER = re.compile(
+    r'^\s*([A-Za-z_]\w*)\s*(>=|<=|==|!=|>|<)\s*'
+    r'(?:([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)|([A-Za-z_]\w*))\s*$'
+)
+_COMPARISONS = {
+    '>=': np.greater_equal,
+    '<=': np.less_equal,
+    '==': np.equal,
+    '!=': np.not_equal,
+    '>': np.greater,
+    '<': np.less,
+}
+
+@lru_cache(maxsize=None)
+def _parse_comparison(condition_str: str) -> Optional[Tuple[str, str, Union[float, str]]]:
+    """
+    Split a simple comparison into (column, operator, number or column)
+    
+    Returns None for anything else. Filters are re-applied to every dataframe
+    a strategy runs on, so each string is parsed once.
+    """
+    match = _COMPARISON_FILTER.match(condition_str)
+    if not match:
+        return None
+    column, op, number, other = match.groups()
+    if keyword.iskeyword(column) or (other is not None and keyword.iskeyword(other)):
+        return None
+    return column, op, float(number) if number is not None else other
+
+def _is_numeric_column(df: pd.DataFrame, column: str) -> bool:
+    return column in df.columns and df[column].dtype.kind in 'iufb'
+
+def _eval_condition(df: pd.DataFrame, condition_str: str) -> pd.Series:
+    """
+    Evaluate a filter expression on the dataframe
+    
+    Comparisons of a numeric column with a number or another numeric column
+    are evaluated directly on the column values, skipping df.eval's parsing;
+    anything else goes through df.eval. Both give the same boolean Series.
+    """
+    parsed = _parse_comparison(condition_str)
+    if parsed is not None and df.columns.is_unique:
+        column, op, operand = parsed
+        if _is_numeric_column(df, column):
+            if isinstance(operand, float):
+                values = _COMPARISONS[op](df[column].to_numpy(), operand)
+                return pd.Series(values, index=df.index, name=column)
+            if _is_numeric_column(df, operand):
+                values = _COMPARISONS[op](df[column].to_numpy(), df[operand].to_numpy())
+                return pd.Series(values, index=df.index, name=column if operand == column else None)
+    
+    return df.eval(condition_str)
+
+def _and_masks(masks: List[np.ndarray]) -> np.ndarray:
+    """
+    AND equal-length boolean arrays, 8 bars per machine word
+    
+    The masks are stacked into rows padded to a multiple of 8 bytes and
+    viewed as uint64, so each bitwise AND combines 8 bars at once.
+    """
+    n = len(masks[0])
+    stacked = np.zeros((len(masks), -(-n // 8) * 8), dtype=np.bool_)
+    for row, mask in enumerate(masks):
+        stacked[row, :n] = mask
+    
+    words = np.bitwise_and.reduce(stacked.view(np.uint64), axis=0)
+    return words.view(np.bool_)[:n]
+
 class StrategyBuilder:
     """
     Build trading strategies by combining patterns with indicator filters
@@ -28,20 +101,47 @@ class StrategyBuilder:
         self.df = df
         self.conditions = []
         self.description = []
+        # conditions as combined by _combine_conditions: boolean arrays for
+        # those on the dataframe's index, the others as given
+        self._condition_arrays = []
         
     def add_condition(self, condition: pd.Series, description: str):
-        """Add a condition to the strategy"""
+        """
+        Add a condition to the strategy
+        
+        Boolean conditions on the dataframe's index are also kept as plain
+        arrays, so combining them needs no pandas operations; others are
+        aligned by pandas in get_entry_signal.
+        """
         self.conditions.append(condition)
+        if (isinstance(condition, pd.Series) and condition.dtype == bool
+                and condition.index.equals(self.df.index)):
+            condition = condition.to_numpy()
+        self._condition_arrays.append(condition)
         self.description.append(description)
         return self
     
     def add_pattern(self, pattern_column: str):
-        """Add a pattern condition"""
-        if pattern_column not in self.df.columns:
+        """
+        Add a pattern condition
+        
+        Uses the pattern column if present, otherwise the pattern's bit in the
+        packed column from patterns.detect_all_patterns_packed.
+        """
+        if pattern_column in self.df.columns:
+            condition = self.df[pattern_column] == 1
+            self.add_condition(condition, f"Pattern: {pattern_column}")
+            return self
+        
+        from patterns import PACKED_PATTERN_COLUMN, PATTERN_BITS
+        if PACKED_PATTERN_COLUMN in self.df.columns and pattern_column in PATTERN_BITS:
+            bit = np.uint32(1 << PATTERN_BITS[pattern_column])
+            packed = self.df[PACKED_PATTERN_COLUMN].to_numpy(dtype=np.uint32)
+            condition = pd.Series((packed & bit) != 0, index=self.df.index)
+            self.add_condition(condition, f"Pattern: {pattern_column}")
+        else:
             raise ValueError(f"Pattern column '{pattern_column}' not found in dataframe")
         
-        condition = self.df[pattern_column] == 1
-        self.add_condition(condition, f"Pattern: {pattern_column}")
         return self
     
     def add_trend_filter(self, condition_str: str):
@@ -55,7 +155,7 @@ class StrategyBuilder:
         'trend_ema_bull_short == 1'
         """
         try:
-            condition = self.df.eval(condition_str)
+            condition = _eval_condition(self.df, condition_str)
             self.add_condition(condition, f"Trend: {condition_str}")
         except Exception as e:
             raise ValueError(f"Invalid trend filter '{condition_str}': {str(e)}")
@@ -72,7 +172,7 @@ class StrategyBuilder:
         'macd > macd_signal'
         """
         try:
-            condition = self.df.eval(condition_str)
+            condition = _eval_condition(self.df, condition_str)
             self.add_condition(condition, f"Momentum: {condition_str}")
         except Exception as e:
             raise ValueError(f"Invalid momentum filter '{condition_str}': {str(e)}")
@@ -88,7 +188,7 @@ class StrategyBuilder:
         'adx_14 < 50'
         """
         try:
-            condition = self.df.eval(condition_str)
+            condition = _eval_condition(self.df, condition_str)
             self.add_condition(condition, f"Strength: {condition_str}")
         except Exception as e:
             raise ValueError(f"Invalid strength filter '{condition_str}': {str(e)}")
@@ -104,7 +204,7 @@ class StrategyBuilder:
         'atr_pct_14 <= 2.0'
         """
         try:
-            condition = self.df.eval(condition_str)
+            condition = _eval_condition(self.df, condition_str)
             self.add_condition(condition, f"Volatility: {condition_str}")
         except Exception as e:
             raise ValueError(f"Invalid volatility filter '{condition_str}': {str(e)}")
@@ -120,7 +220,7 @@ class StrategyBuilder:
         'abs(close - ema_20) <= atr_14 * 2'
         """
         try:
-            condition = self.df.eval(condition_str)
+            condition = _eval_condition(self.df, condition_str)
             self.add_condition(condition, f"Proximity: {condition_str}")
         except Exception as e:
             raise ValueError(f"Invalid proximity filter '{condition_str}': {str(e)}")
@@ -136,12 +236,21 @@ class StrategyBuilder:
         'Volume > volume_sma_20'
         """
         try:
-            condition = self.df.eval(condition_str)
+            condition = _eval_condition(self.df, condition_str)
             self.add_condition(condition, f"Volume: {condition_str}")
         except Exception as e:
             raise ValueError(f"Invalid volume filter '{condition_str}': {str(e)}")
         return self
     
+    def add_mask(self, mask: np.ndarray, description: str):
+        """
+        Add a precomputed boolean mask aligned with the dataframe rows
+        
+        Lets several strategies share filters evaluated once on the same data.
+        """
+        self.add_condition(pd.Series(mask, index=self.df.index, dtype=bool), description)
+        return self
+    
     def add_custom_filter(self, condition: pd.Series, description: str):
         """Add a custom condition"""
         self.add_condition(condition, f"Custom: {description}")
@@ -155,12 +264,47 @@ class StrategyBuilder:
         --------
         pd.Series with boolean entry signals
         """
+        signal = self._combine_conditions()
+        if isinstance(signal, np.ndarray):
+            return pd.Series(signal, index=self.df.index)
+        return signal
+    
+    def get_entry_signal_array(self) -> np.ndarray:
+        """
+        Get the final entry signal as a boolean array, without the Series wrapper
+        
+        Returns:
+        --------
+        np.ndarray with one boolean per signal row (the dataframe rows unless
+        custom conditions carry a different index)
+        """
+        signal = self._combine_conditions()
+        if isinstance(signal, np.ndarray):
+            return signal
+        return signal.to_numpy(dtype=bool)
+    
+    def _combine_conditions(self):
+        """AND all conditions: an array when they align with the dataframe, else a Series"""
         if len(self.conditions) == 0:
             raise ValueError("No conditions added to strategy")
         
-        # Combine all conditions with AND logic
-        signal = self.conditions[0]
-        for condition in self.conditions[1:]:
+        if len(self._condition_arrays) == len(self.conditions):
+            conditions = list(self._condition_arrays)
+        else:
+            # conditions was modified directly
+            conditions = list(self.conditions)
+        
+        n = len(self.df)
+        if all(isinstance(c, np.ndarray) and c.dtype == bool and c.shape == (n,) for c in conditions):
+            return _and_masks(conditions)
+        
+        # Combine all conditions with AND logic (pandas aligns differing indexes)
+        conditions = [
+            pd.Series(c, index=self.df.index) if isinstance(c, np.ndarray) and c.shape == (n,) else c
+            for c in conditions
+        ]
+        signal = conditions[0]
+        for condition in conditions[1:]:
             signal = signal & condition
         
         return signal
@@ -174,12 +318,13 @@ class StrategyBuilder:
     
     def count_signals(self) -> int:
         """Count number of entry signals"""
-        return self.get_entry_signal().sum()
+        return self.get_entry_signal_array().sum()
     
     def reset(self):
         """Reset strategy conditions"""
         self.conditions = []
         self.description = []
+        self._condition_arrays = []
         return self
 
 
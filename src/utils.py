@@ -4,7 +4,7 @@ Utility functions for the commodity trading framework
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import logging
 
 # Setup logging
@@ -17,6 +17,80 @@ def get_logger(name: str):
     """Get a logger instance"""
     return logging.getLogger(name)
 
+# Column types of the raw OHLC CSVs (Volume is left to inference)
+OHLC_DTYPES = {'open': 'float64', 'high': 'float64', 'low': 'float64', 'close': 'float64'}
+
+# Parsed data CSVs by resolved path: ((mtime_ns, size) of the CSV, frame)
+_csv_frames: Dict[Path, Tuple[Tuple[int, int], pd.DataFrame]] = {}
+
+def _load_csv_sidecar(sidecar: Path, key: Tuple[int, int]) -> Optional[pd.DataFrame]:
+    """Frame stored by _save_csv_sidecar, or None if it was stored for another version of the CSV"""
+    # allow_pickle=False: the file can only hold plain arrays, never objects to unpickle
+    with np.load(sidecar, allow_pickle=False) as stored:
+        if tuple(stored['key'].tolist()) != key:
+            return None
+        columns = stored['columns'].tolist()
+        return pd.DataFrame({name: stored[f'col{i}'] for i, name in enumerate(columns)})
+
+def _save_csv_sidecar(sidecar: Path, key: Tuple[int, int], df: pd.DataFrame) -> bool:
+    """
+    Store a parsed CSV as .npz arrays, one per column
+    
+    Only numeric, boolean and datetime64 columns can be stored without
+    pickling; frames with other columns are not cached and False is returned.
+    """
+    if not all(isinstance(dtype, np.dtype) and dtype.kind in 'biufM' for dtype in df.dtypes):
+        return False
+    
+    arrays = {f'col{i}': df[name].to_numpy() for i, name in enumerate(df.columns)}
+    # Written under a temporary name first so readers never see a partial file
+    partial = sidecar.with_suffix('.npz.tmp')
+    with open(partial, 'wb') as f:
+        np.savez(f, key=np.array(key, dtype=np.int64), columns=np.array(df.columns, dtype=str), **arrays)
+    partial.replace(sidecar)
+    return True
+
+def _read_data_csv(file_path: Path, dtype: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """
+    Read a data CSV with its 'time' column parsed, through two caches
+    
+    Parsed frames are kept in memory for the process and stored next to the
+    CSV as plain arrays (same name, .npz suffix). Both are keyed by the CSV's
+    modification time and size, so an edited CSV is parsed again. Every call
+    returns a new copy that the caller may modify.
+    
+    dtype declares known column types to pd.read_csv, which then skips
+    inferring them.
+    """
+    logger = get_logger(__name__)
+    
+    stat = file_path.stat()
+    key = (stat.st_mtime_ns, stat.st_size)
+    cache_key = file_path.resolve()
+    
+    cached = _csv_frames.get(cache_key)
+    if cached is not None and cached[0] == key:
+        return cached[1].copy()
+    
+    df = None
+    sidecar = file_path.with_suffix('.npz')
+    if sidecar.exists():
+        try:
+            df = _load_csv_sidecar(sidecar, key)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache {sidecar}: {e}")
+    
+    if df is None:
+        df = pd.read_csv(file_path, dtype=dtype, parse_dates=['time'], cache_dates=True)
+        
+        try:
+            _save_csv_sidecar(sidecar, key, df)
+        except OSError as e:
+            logger.warning(f"Could not write cache {sidecar}: {e}")
+    
+    _csv_frames[cache_key] = (key, df)
+    return df.copy()
+
 def load_ohlc_data(commodity: str, timeframe: str, data_dir: str = "data/raw") -> pd.DataFrame:
     """
     Load OHLC data for a given commodity and timeframe
@@ -62,8 +136,7 @@ def load_ohlc_data(commodity: str, timeframe: str, data_dir: str = "data/raw") -
     
     logger.info(f"Loading {commodity.upper()} {timeframe.upper()} data from {file_path}")
     
-    df = pd.read_csv(file_path)
-    df['time'] = pd.to_datetime(df['time'])
+    df = _read_data_csv(file_path, dtype=OHLC_DTYPES)
     df = df.sort_values('time').reset_index(drop=True)
     
     logger.info(f"Loaded {len(df)} bars from {df['time'].min()} to {df['time'].max()}")
@@ -104,10 +177,7 @@ def load_features(commodity: str, timeframe: str, data_dir: str = "data/processe
     if not file_path.exists():
         raise FileNotFoundError(f"Features file not found: {file_path}. Run feature engineering first.")
     
-    df = pd.read_csv(file_path)
-    df['time'] = pd.to_datetime(df['time'])
-    
-    return df
+    return _read_data_csv(file_path)
 
 def calculate_returns(df: pd.DataFrame, price_col: str = 'close') -> pd.Series:
     """Calculate percentage returns"""
@@ -151,14 +221,17 @@ def create_summary_stats(results: pd.DataFrame) -> Dict:
     
     profit_factor = total_wins / total_losses if total_losses > 0 else (float('inf') if total_wins > 0 else 0)
     
-    # Calculate drawdown
-    equity_curve = results['pnl'].cumsum()
-    running_max = equity_curve.expanding().max()
+    # Calculate drawdown; missing PnL is skipped like Series.cumsum/expanding().max()
+    pnl = results['pnl'].to_numpy(dtype=np.float64)
+    equity_curve = np.nancumsum(pnl)
+    equity_curve[np.isnan(pnl)] = np.nan
+    running_max = np.fmax.accumulate(equity_curve)
     drawdown = equity_curve - running_max
-    max_dd = drawdown.min()
+    max_dd_at = int(np.nanargmin(drawdown))
+    max_dd = drawdown[max_dd_at]
     
     # Calculate max DD as percentage of peak
-    peak_at_max_dd = running_max[drawdown.idxmin()] if len(drawdown) > 0 else 1
+    peak_at_max_dd = running_max[max_dd_at]
     max_dd_pct = abs(max_dd / peak_at_max_dd * 100) if peak_at_max_dd != 0 else 0
     
     return {
@@ -14,20 +14,30 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Any, Tuple, Optional
 import yaml
 from pathlib import Path
-import warnings
-warnings.filterwarnings('ignore')
 
 from src.yahoo_finance_fetcher import YahooFinanceFetcher
 from src.backtest_engine import BacktestEngine, Trade
+from _backtest_loops import _fixed_level_exits, EXIT_STOP_LOSS, EXIT_TAKE_PROFIT, EXIT_TIME
+from _pattern_kernels import _rolling_extreme, _rolling_mean, _simple_patterns, SIMPLE_PATTERN_NAMES
 from src.utils import get_logger
 
 logger = get_logger(__name__)
 
+# Trade.exit_reason for the exit codes of _fixed_level_exits
+EXIT_REASON_LABELS = {
+    EXIT_STOP_LOSS: 'Stop Loss',
+    EXIT_TAKE_PROFIT: 'Take Profit',
+    EXIT_TIME: 'Time Exit'
+}
+
 class YahooBacktestEngine:
     """
     Backtest engine that uses Yahoo Finance data for live backtesting
     """
     
+    # Price data and features of the last call per (commodity, timeframe, period)
+    _features_cache: Dict[Tuple[str, str, str], Tuple[pd.DataFrame, pd.DataFrame]] = {}
+    
     def __init__(self):
         self.yahoo_fetcher = YahooFinanceFetcher()
         
@@ -35,6 +45,10 @@ class YahooBacktestEngine:
                                    period: str = '1y') -> pd.DataFrame:
         """
         Get Yahoo Finance data and calculate basic technical indicators
+        
+        The features are recomputed only when the fetched price data differs
+        from that of the previous call for the same commodity, timeframe and
+        period.
         """
         try:
             # Map timeframe to interval
@@ -70,11 +84,20 @@ class YahooBacktestEngine:
                     'volume': 'sum'
                 }).dropna()
             
-            # Calculate basic technical indicators
-            df = self._calculate_technical_indicators(df)
-            
-            # Calculate simple pattern detection
-            df = self._calculate_simple_patterns(df)
+            key = (commodity, timeframe, period)
+            cached = self._features_cache.get(key)
+            if cached is not None and cached[0].equals(df):
+                df = cached[1].copy()
+            else:
+                prices = df
+                
+                # Calculate basic technical indicators
+                df = self._calculate_technical_indicators(df)
+                
+                # Calculate simple pattern detection
+                df = self._calculate_simple_patterns(df)
+                
+                self._features_cache[key] = (prices, df.copy())
             
             logger.info(f"Yahoo Finance data for {commodity} {timeframe}: {len(df)} records from {df.index[0]} to {df.index[-1]}")
             return df
@@ -84,82 +107,104 @@ class YahooBacktestEngine:
             return pd.DataFrame()
     
     def _calculate_technical_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Calculate basic technical indicators for Yahoo Finance data."""
+        """
+        Calculate basic technical indicators for Yahoo Finance data.
+        
+        The indicators are computed from the price columns read once and
+        added to the dataframe together, as a new dataframe. Rolling means use
+        the _rolling_mean kernel, which reproduces pandas rolling().mean().
+        
+        Columns only reported, not compared against strategy thresholds, are
+        stored in float32 after being computed in float64; RSI and the EMAs
+        used by the entry filters stay float64.
+        """
         try:
-            # Simple Moving Averages
-            df['sma_20'] = df['close'].rolling(window=20).mean()
-            df['sma_50'] = df['close'].rolling(window=50).mean()
-            
-            # Exponential Moving Averages
-            df['ema_20'] = df['close'].ewm(span=20).mean()
-            df['ema_50'] = df['close'].ewm(span=50).mean()
-            
-            # RSI
-            delta = df['close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-            rs = gain / loss
-            df['rsi_14'] = 100 - (100 / (1 + rs))
-            
-            # ATR
-            high_low = df['high'] - df['low']
-            high_close = np.abs(df['high'] - df['close'].shift())
-            low_close = np.abs(df['low'] - df['close'].shift())
-            ranges = pd.concat([high_low, high_close, low_close], axis=1)
-            true_range = ranges.max(axis=1)
-            df['atr'] = true_range.rolling(window=14).mean()
-            df['atr_pct'] = (df['atr'] / df['close']) * 100
-            
-            # ADX (simplified)
-            df['adx_14'] = 20  # Placeholder - would need more complex calculation
-            
-            # Volume indicators
-            df['volume_sma'] = df['volume'].rolling(window=20).mean()
-            df['volume_ratio'] = df['volume'] / df['volume_sma']
-            
-            return df
+            close = df['close']
+            volume = df['volume']
+            
+            def rolling_mean(values: np.ndarray, window: int) -> pd.Series:
+                return pd.Series(_rolling_mean(values, window), index=df.index)
+            
+            close_values = close.to_numpy(dtype=np.float64)
+            sma_20 = rolling_mean(close_values, 20)
+            volume_sma = rolling_mean(volume.to_numpy(dtype=np.float64), 20)
+            
+            # RSI (simple-average form, as in indicators.calculate_rsi)
+            delta = close.diff().to_numpy()
+            rs = (rolling_mean(np.where(delta > 0, delta, 0.0), 14) /
+                  rolling_mean(np.where(delta < 0, -delta, 0.0), 14))
+            
+            # ATR; fmax skips the missing previous close on the first bar like
+            # DataFrame.max(axis=1)
+            high = df['high'].to_numpy()
+            low = df['low'].to_numpy()
+            prev_close = close.shift().to_numpy()
+            true_range = np.fmax(np.fmax(high - low, np.abs(high - prev_close)), np.abs(low - prev_close))
+            atr = rolling_mean(true_range, 14)
+            
+            return df.assign(
+                # Simple Moving Averages
+                sma_20=sma_20.astype(np.float32),
+                sma_50=rolling_mean(close_values, 50).astype(np.float32),
+                
+                # Exponential Moving Averages
+                ema_20=close.ewm(span=20).mean(),
+                ema_50=close.ewm(span=50).mean(),
+                
+                rsi_14=100 - (100 / (1 + rs)),
+                atr=atr.astype(np.float32),
+                atr_pct=((atr / close) * 100).astype(np.float32),
+                
+                # ADX (simplified)
+                adx_14=20,  # Placeholder - would need more complex calculation
+                
+                # Volume indicators
+                volume_sma=volume_sma.astype(np.float32),
+                volume_ratio=(volume / volume_sma).astype(np.float32)
+            )
             
         except Exception as e:
             logger.error(f"Error calculating technical indicators: {e}")
             return df
     
     def _calculate_simple_patterns(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Calculate simple pattern detection for Yahoo Finance data."""
+        """
+        Calculate simple pattern detection for Yahoo Finance data.
+        
+        All pattern flags are evaluated in one pass over the price arrays by
+        _simple_patterns and stored as int8 columns; the bar range and its
+        average are kept in float32.
+        """
         try:
-            # Doji pattern
-            df['pattern_doji'] = ((abs(df['open'] - df['close']) / (df['high'] - df['low'])) < 0.1).astype(int)
-            
-            # Hammer pattern (simplified)
-            body = abs(df['close'] - df['open'])
-            lower_shadow = df[['open', 'close']].min(axis=1) - df['low']
-            upper_shadow = df['high'] - df[['open', 'close']].max(axis=1)
-            
-            df['pattern_hammer'] = (
-                (lower_shadow > 2 * body) & 
-                (upper_shadow < body) & 
-                (df['close'] > df['open'])
-            ).astype(int)
-            
-            # Breakout patterns (simplified)
-            df['high_20'] = df['high'].rolling(window=20).max()
-            df['low_20'] = df['low'].rolling(window=20).min()
-            
-            df['pattern_breakout_10'] = (df['close'] > df['high'].shift(1) * 1.001).astype(int)
-            df['pattern_breakout_20'] = (df['close'] > df['high_20'].shift(1)).astype(int)
-            
-            # Range expansion (simplified)
-            df['range'] = df['high'] - df['low']
-            df['range_sma'] = df['range'].rolling(window=10).mean()
-            df['pattern_range_expansion'] = (df['range'] > df['range_sma'] * 1.5).astype(int)
-            
-            # Inside bar
-            df['inside_bar'] = (
-                (df['high'] < df['high'].shift(1)) & 
-                (df['low'] > df['low'].shift(1))
-            ).astype(int)
-            df['pattern_inside_bar'] = df['inside_bar']
-            
-            return df
+            open_ = df['open'].to_numpy(dtype=np.float64)
+            high = df['high'].to_numpy(dtype=np.float64)
+            low = df['low'].to_numpy(dtype=np.float64)
+            close = df['close'].to_numpy(dtype=np.float64)
+            
+            # Breakout levels and range expansion baseline
+            high_20 = _rolling_extreme(high, 20, True)
+            low_20 = _rolling_extreme(low, 20, False)
+            bar_range = high - low
+            range_sma = _rolling_mean(bar_range, 10)
+            
+            flags = np.empty((len(SIMPLE_PATTERN_NAMES), len(df)), dtype=np.int8)
+            _simple_patterns(open_, high, low, close, high_20, range_sma, flags)
+            patterns = dict(zip(SIMPLE_PATTERN_NAMES, flags))
+            
+            return df.assign(
+                pattern_doji=patterns['pattern_doji'],
+                pattern_hammer=patterns['pattern_hammer'],
+                high_20=high_20,
+                low_20=low_20,
+                pattern_breakout_10=patterns['pattern_breakout_10'],
+                pattern_breakout_20=patterns['pattern_breakout_20'],
+                # Stored in float32; the expansion flag above used the float64 values
+                range=bar_range.astype(np.float32),
+                range_sma=range_sma.astype(np.float32),
+                pattern_range_expansion=patterns['pattern_range_expansion'],
+                inside_bar=patterns['inside_bar'],
+                pattern_inside_bar=patterns['inside_bar']
+            )
             
         except Exception as e:
             logger.error(f"Error calculating patterns: {e}")
@@ -185,9 +230,13 @@ class YahooBacktestEngine:
             return {}
     
     def run_yahoo_backtest(self, commodity: str, timeframe: str, 
-                          period: str = '1y') -> Dict[str, Any]:
+                          period: str = '1y', include_trades: bool = True) -> Dict[str, Any]:
         """
         Run backtest using Yahoo Finance data
+        
+        With include_trades=False no Trade objects are built: the performance
+        metrics are computed from the PnL arrays of each strategy and the
+        result's 'trades' list is empty.
         """
         try:
             logger.info(f"Starting Yahoo Finance backtest for {commodity} {timeframe} ({period})")
@@ -219,19 +268,31 @@ class YahooBacktestEngine:
                     strategies.append(value)
             
             all_trades = []
+            pnl_parts = []
             
             for strategy in strategies:
                 try:
                     # Run backtest for this strategy
-                    strategy_trades = self._run_strategy_backtest(df, strategy, commodity, timeframe)
-                    all_trades.extend(strategy_trades)
+                    if include_trades:
+                        strategy_trades = self._run_strategy_backtest(df, strategy, commodity, timeframe)
+                        all_trades.extend(strategy_trades)
+                    else:
+                        pnl_parts.append(self._run_strategy_pnl(df, strategy))
                     
                 except Exception as e:
                     logger.error(f"Error running backtest for strategy {strategy.get('name', 'Unknown')}: {e}")
                     continue
             
             # Calculate performance metrics
-            performance = self._calculate_performance_metrics(all_trades, df)
+            if include_trades:
+                performance = self._calculate_performance_metrics(all_trades, df)
+            elif pnl_parts:
+                performance = self._calculate_fast_metrics(
+                    np.concatenate([pnl for pnl, _ in pnl_parts]),
+                    np.concatenate([pnl_pct for _, pnl_pct in pnl_parts])
+                )
+            else:
+                performance = self._calculate_fast_metrics(np.empty(0), np.empty(0))
             
             # Sort trades by entry time
             all_trades.sort(key=lambda x: x.entry_time)
@@ -262,135 +323,176 @@ class YahooBacktestEngine:
                               commodity: str, timeframe: str) -> List[Trade]:
         """Run backtest for a single strategy on Yahoo Finance data."""
         try:
-            pattern_name = strategy['pattern']
-            pattern_col = f"pattern_{pattern_name}"  # Yahoo Finance data already has pattern_ prefix
+            signal_idx = self._find_strategy_signals(df, strategy)
             
-            if pattern_col not in df.columns:
-                logger.warning(f"Pattern column {pattern_col} not found in Yahoo Finance data")
+            if signal_idx.size == 0:
                 return []
             
-            # Get entry conditions
-            filters = strategy['entry_conditions']['filters']
-            exit_rules = strategy['exit_rules']
+            stop_loss_factor = 1 - strategy['exit_rules'].get('stop_loss_pct', 2.0) / 100
+            take_profit_factor = 1 + strategy['exit_rules'].get('take_profit_pct', 4.0) / 100
+            closes = df['close'].to_numpy()
+            
+            # Create trade objects (using the correct Trade class structure)
+            opened = [
+                Trade(
+                    entry_idx=i,
+                    entry_time=df.index[i],
+                    entry_price=closes[i],
+                    direction='long',
+                    stop_loss=closes[i] * stop_loss_factor,
+                    take_profit=closes[i] * take_profit_factor
+                )
+                for i in signal_idx.tolist()
+            ]
+            
+            # Simulate all trade outcomes at once, keeping the trades that closed
+            trades = self._simulate_trade_outcomes(opened, df, strategy['exit_rules'])
             
-            # Create entry conditions (simplified for Yahoo Finance data)
-            conditions = df[pattern_col] == 1
+            logger.info(f"Strategy {strategy['name']}: {len(trades)} completed trades")
+            return trades
             
-            # Apply basic filters
-            if 'rsi_min' in filters and 'rsi_14' in df.columns:
-                conditions &= df['rsi_14'] >= filters['rsi_min']
-            if 'rsi_max' in filters and 'rsi_14' in df.columns:
-                conditions &= df['rsi_14'] <= filters['rsi_max']
+        except Exception as e:
+            logger.error(f"Error running strategy backtest: {e}")
+            return []
+    
+    def _run_strategy_pnl(self, df: pd.DataFrame, strategy: Dict) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Run backtest for a single strategy, returning only the PnL and PnL %
+        of its completed trades (in entry order) instead of Trade objects.
+        """
+        try:
+            signal_idx = self._find_strategy_signals(df, strategy)
             
-            # Apply trend filter if specified
-            if 'trend_filter' in strategy['entry_conditions'] and strategy['entry_conditions']['trend_filter'] == 'uptrend':
-                if 'ema_20' in df.columns and 'ema_50' in df.columns:
-                    conditions &= df['ema_20'] > df['ema_50']
+            if signal_idx.size == 0:
+                return np.empty(0), np.empty(0)
             
-            # Find signal points
-            signal_points = df[conditions]
+            stop_loss_factor = 1 - strategy['exit_rules'].get('stop_loss_pct', 2.0) / 100
+            take_profit_factor = 1 + strategy['exit_rules'].get('take_profit_pct', 4.0) / 100
+            closes = df['close'].to_numpy(dtype=np.float64)
+            entry_prices = closes[signal_idx]
             
-            if signal_points.empty:
-                logger.info(f"No signals found for strategy {strategy['name']}")
-                return []
+            exit_idx, exit_prices, _, _ = _fixed_level_exits(
+                signal_idx.astype(np.int64),
+                df['high'].to_numpy(dtype=np.float64),
+                df['low'].to_numpy(dtype=np.float64),
+                closes,
+                entry_prices * stop_loss_factor,
+                entry_prices * take_profit_factor,
+                strategy['exit_rules'].get('max_hold_bars', 10)
+            )
             
-            trades = []
+            closed = exit_idx >= 0
+            pnl = exit_prices[closed] - entry_prices[closed]
+            pnl_pct = (pnl / entry_prices[closed]) * 100
             
-            for timestamp, row in signal_points.iterrows():
-                try:
-                    # Create trade object (using the correct Trade class structure)
-                    trade = Trade(
-                        entry_idx=df.index.get_loc(timestamp),
-                        entry_time=timestamp,
-                        entry_price=row['close'],
-                        direction='long',
-                        stop_loss=row['close'] * (1 - strategy['exit_rules'].get('stop_loss_pct', 2.0) / 100),
-                        take_profit=row['close'] * (1 + strategy['exit_rules'].get('take_profit_pct', 4.0) / 100)
-                    )
-                    
-                    # Simulate trade outcome
-                    trade = self._simulate_trade_outcome(trade, df, exit_rules)
-                    
-                    if trade.exit_price is not None:  # Trade was closed
-                        trades.append(trade)
-                        
-                except Exception as e:
-                    logger.error(f"Error processing trade at {timestamp}: {e}")
-                    continue
-            
-            logger.info(f"Strategy {strategy['name']}: {len(trades)} completed trades")
-            return trades
+            logger.info(f"Strategy {strategy['name']}: {len(pnl)} completed trades")
+            return pnl, pnl_pct
             
         except Exception as e:
             logger.error(f"Error running strategy backtest: {e}")
-            return []
+            return np.empty(0), np.empty(0)
     
-    def _simulate_trade_outcome(self, trade: Trade, df: pd.DataFrame, 
-                               exit_rules: Dict) -> Trade:
-        """Simulate the outcome of a trade using Yahoo Finance data."""
+    def _find_strategy_signals(self, df: pd.DataFrame, strategy: Dict) -> np.ndarray:
+        """Bar positions where a strategy's pattern and entry filters are met."""
+        pattern_name = strategy['pattern']
+        pattern_col = f"pattern_{pattern_name}"  # Yahoo Finance data already has pattern_ prefix
+        
+        if pattern_col not in df.columns:
+            logger.warning(f"Pattern column {pattern_col} not found in Yahoo Finance data")
+            return np.empty(0, dtype=np.intp)
+        
+        # Get entry conditions
+        filters = strategy['entry_conditions']['filters']
+            
+        # Create entry conditions (simplified for Yahoo Finance data) as
+        # boolean arrays, combined once all filters are known
+        masks = [df[pattern_col].to_numpy() == 1]
+        
+        # Apply basic filters
+        if 'rsi_min' in filters and 'rsi_14' in df.columns:
+            masks.append(df['rsi_14'].to_numpy() >= filters['rsi_min'])
+        if 'rsi_max' in filters and 'rsi_14' in df.columns:
+            masks.append(df['rsi_14'].to_numpy() <= filters['rsi_max'])
+        
+        # Apply trend filter if specified
+        if 'trend_filter' in strategy['entry_conditions'] and strategy['entry_conditions']['trend_filter'] == 'uptrend':
+            if 'ema_20' in df.columns and 'ema_50' in df.columns:
+                masks.append(df['ema_20'].to_numpy() > df['ema_50'].to_numpy())
+        
+        conditions = np.logical_and.reduce(masks)
+        
+        # Find signal points (bar positions, so no rows are materialized)
+        signal_idx = np.flatnonzero(conditions)
+        
+        if signal_idx.size == 0:
+            logger.info(f"No signals found for strategy {strategy['name']}")
+        
+        return signal_idx
+    
+    def _simulate_trade_outcomes(self, trades: List[Trade], df: pd.DataFrame,
+                                 exit_rules: Dict) -> List[Trade]:
+        """
+        Simulate the outcome of trades using Yahoo Finance data.
+        
+        The exits are found by the compiled _fixed_level_exits kernel; trades
+        whose time exit falls beyond the data stay open and are left out.
+        """
         try:
+            if not trades:
+                return []
+            
             # Get exit parameters
             max_hold_bars = exit_rules.get('max_hold_bars', 10)
-            entry_idx = trade.entry_idx
-            entry_price = trade.entry_price
-            stop_loss_price = trade.stop_loss
-            take_profit_price = trade.take_profit
-            
-            # Simulate the trade forward
-            for i in range(1, min(max_hold_bars + 1, len(df) - entry_idx)):
-                current_idx = entry_idx + i
-                if current_idx >= len(df):
-                    break
-                
-                current_bar = df.iloc[current_idx]
-                high = current_bar['high']
-                low = current_bar['low']
-                close = current_bar['close']
-                
-                # Check for stop loss hit
-                if low <= stop_loss_price:
-                    trade.exit_idx = current_idx
-                    trade.exit_time = df.index[current_idx]
-                    trade.exit_price = stop_loss_price
-                    trade.pnl = stop_loss_price - entry_price
-                    trade.pnl_pct = (trade.pnl / entry_price) * 100
-                    trade.bars_held = i
-                    trade.exit_reason = 'Stop Loss'
-                    break
-                
-                # Check for take profit hit
-                if high >= take_profit_price:
-                    trade.exit_idx = current_idx
-                    trade.exit_time = df.index[current_idx]
-                    trade.exit_price = take_profit_price
-                    trade.pnl = take_profit_price - entry_price
-                    trade.pnl_pct = (trade.pnl / entry_price) * 100
-                    trade.bars_held = i
-                    trade.exit_reason = 'Take Profit'
-                    break
-            
-            # If max hold bars reached, exit at close
-            if trade.exit_price is None:
-                final_idx = entry_idx + max_hold_bars
-                if final_idx < len(df):
-                    trade.exit_idx = final_idx
-                    trade.exit_time = df.index[final_idx]
-                    trade.exit_price = df.iloc[final_idx]['close']
-                    trade.pnl = trade.exit_price - entry_price
-                    trade.pnl_pct = (trade.pnl / entry_price) * 100
-                    trade.bars_held = max_hold_bars
-                    trade.exit_reason = 'Time Exit'
-            
-            return trade
+            
+            exit_idx, exit_prices, bars_held, reasons = _fixed_level_exits(
+                np.array([t.entry_idx for t in trades], dtype=np.int64),
+                df['high'].to_numpy(dtype=np.float64),
+                df['low'].to_numpy(dtype=np.float64),
+                df['close'].to_numpy(dtype=np.float64),
+                np.array([t.stop_loss for t in trades], dtype=np.float64),
+                np.array([t.take_profit for t in trades], dtype=np.float64),
+                max_hold_bars
+            )
+            
+            closed = []
+            for trade, idx, exit_price, held, reason in zip(
+                trades, exit_idx.tolist(), exit_prices, bars_held.tolist(), reasons.tolist()
+            ):
+                if idx < 0:
+                    continue
+                trade.exit_idx = idx
+                trade.exit_time = df.index[idx]
+                trade.exit_price = exit_price
+                trade.pnl = exit_price - trade.entry_price
+                trade.pnl_pct = (trade.pnl / trade.entry_price) * 100
+                trade.bars_held = held
+                trade.exit_reason = EXIT_REASON_LABELS[reason]
+                closed.append(trade)
+            
+            return closed
             
         except Exception as e:
-            logger.error(f"Error simulating trade outcome: {e}")
-            return trade
+            logger.error(f"Error simulating trade outcomes: {e}")
+            return []
     
     def _calculate_performance_metrics(self, trades: List[Trade], df: pd.DataFrame) -> Dict[str, Any]:
         """Calculate performance metrics for Yahoo Finance backtest."""
         try:
-            if not trades:
+            pnl = np.fromiter((t.pnl for t in trades), dtype=np.float64, count=len(trades))
+            pnl_pct = np.fromiter((t.pnl_pct for t in trades if t.pnl_pct is not None), dtype=np.float64)
+        except Exception as e:
+            logger.error(f"Error calculating performance metrics: {e}")
+            return {}
+        
+        return self._calculate_fast_metrics(pnl, pnl_pct)
+    
+    def _calculate_fast_metrics(self, pnl: np.ndarray, pnl_pct: np.ndarray) -> Dict[str, Any]:
+        """
+        Calculate performance metrics from the PnL and PnL % arrays of the
+        trades, in trade order.
+        """
+        try:
+            if len(pnl) == 0:
                 return {
                     'total_trades': 0,
                     'winning_trades': 0,
@@ -403,30 +505,35 @@ class YahooBacktestEngine:
                     'sharpe_ratio': 0
                 }
             
-            total_trades = len(trades)
-            winning_trades = len([t for t in trades if t.pnl > 0])
-            losing_trades = len([t for t in trades if t.pnl < 0])
+            total_trades = len(pnl)
+            wins = pnl > 0
+            losses = pnl < 0
+            
+            winning_trades = int(wins.sum())
+            losing_trades = int(losses.sum())
             
-            total_pnl = sum([t.pnl for t in trades])
-            avg_pnl = total_pnl / total_trades if total_trades > 0 else 0
+            total_pnl = pnl.sum()
+            avg_pnl = total_pnl / total_trades
             
-            win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
+            win_rate = winning_trades / total_trades * 100
             
             # Profit factor
-            gross_profit = sum([t.pnl for t in trades if t.pnl > 0])
-            gross_loss = abs(sum([t.pnl for t in trades if t.pnl < 0]))
+            gross_profit = pnl[wins].sum()
+            gross_loss = abs(pnl[losses].sum())
             profit_factor = gross_profit / gross_loss if gross_loss > 0 else float('inf') if gross_profit > 0 else 0
             
             # Calculate cumulative PnL for drawdown
-            cumulative_pnl = np.cumsum([t.pnl for t in trades])
+            cumulative_pnl = np.cumsum(pnl)
             running_max = np.maximum.accumulate(cumulative_pnl)
             drawdown = running_max - cumulative_pnl
-            max_drawdown = np.max(drawdown) if len(drawdown) > 0 else 0
-            max_drawdown_pct = (max_drawdown / np.max(running_max) * 100) if np.max(running_max) > 0 else 0
+            max_drawdown = drawdown.max()
+            peak = running_max.max()
+            max_drawdown_pct = (max_drawdown / peak * 100) if peak > 0 else 0
             
             # Sharpe ratio (simplified)
-            returns = [t.pnl_pct for t in trades if t.pnl_pct is not None]
-            sharpe_ratio = np.mean(returns) / np.std(returns) if len(returns) > 1 and np.std(returns) > 0 else 0
+            returns = pnl_pct
+            returns_std = returns.std() if len(returns) > 1 else 0
+            sharpe_ratio = returns.mean() / returns_std if returns_std > 0 else 0
             
             return {
                 'total_trades': total_trades,